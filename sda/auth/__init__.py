@@ -1,9 +1,9 @@
-from .config import get_config, PostgresDefaults, EnvFileNames
+from .config import get_config, clear_config_cache, PostgresDefaults, EnvFileNames
 from .config import EnvFields, LogLevels, DefaultDirectories, Profiles
 from .config import profile_load, verify_pass, Config
 
 __all__ = [
-    "get_config", "PostgresDefaults", "EnvFileNames",
+    "get_config", "clear_config_cache", "PostgresDefaults", "EnvFileNames",
     "EnvFields", "LogLevels", "DefaultDirectories",
     "Profiles", "profile_load", "verify_pass", "Config"
 ]
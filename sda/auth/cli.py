@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from pathlib import Path
+import json
 import os
 import secrets
 import subprocess
 import typer
+from dotenv import dotenv_values
 
 from sda.auth import verify_pass, EnvFileNames
+from sda.auth.config import compiled_env_path
 
 # Variables / Constants for usage
 app = typer.Typer(add_completion=False, no_args_is_help=True)
@@ -20,3 +23,35 @@ def _ensure_dirs(data_dir: str, cache_dir: str) -> None:
     Path(cache_dir).mkdir(parents=True, exist_ok=True)
 
 
+@app.command("compile-env")
+def compile_env(profile: str = typer.Option("user", help="Profile whose env file is compiled (user|dev).")) -> None:
+    """
+    Compile the profile env file into a JSON file in the user cache dir.
+
+    profile_load() reads it instead of re-parsing the env file as long as
+    the env file keeps the absolute path and mtime recorded here. The file
+    holds secrets and is written with mode 0600.
+    """
+    file_names = EnvFileNames()
+    source = file_names.DEV if profile == "dev" else file_names.USER
+    if not Path(source).is_file():
+        raise typer.BadParameter(f"env file not found: {source}")
+
+    values = {k: v for k, v in dotenv_values(source).items() if v is not None}
+    compiled = {
+        "source": os.path.abspath(source),
+        "mtime_ns": os.stat(source).st_mtime_ns,
+        "env": values,
+    }
+    target = compiled_env_path(source)
+    target.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    tmp = target.with_suffix(".tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(compiled, f)
+    os.replace(tmp, target)
+    typer.echo(f"Compiled {source} -> {target}")
+
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+"""
+SHA-256 digests of registered files (assets, index artifacts).
+"""
+
+import hashlib
+import mmap
+import os
+import stat
+from functools import lru_cache
+
+_SHA256_TEMPLATE = hashlib.sha256()
+
+# Files up to this size are hashed through mmap, larger ones in chunks.
+_MMAP_MAX_BYTES = 1 << 30
+_CHUNK_BYTES = 1 << 20
+
+
+def hash_file(path: str) -> bytes:
+    """
+    Return the SHA256 digest of file contents without loading the file into memory.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if 0 < size <= _MMAP_MAX_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                h.update(mm)
+        else:
+            buf = bytearray(_CHUNK_BYTES)
+            view = memoryview(buf)
+            while n := f.readinto(buf):
+                h.update(view[:n])
+    return h.digest()
+
+
+@lru_cache(maxsize=4096)
+def hash_path(path: str) -> bytes:
+    """
+    Return the SHA256 digest of the path string itself.
+    """
+    h = _SHA256_TEMPLATE.copy()
+    h.update(path.encode("utf-8"))
+    return h.digest()
+
+
+def hash_file_or_path(path: str) -> bytes:
+    """
+    Return the SHA256 digest of file contents when the file exists,
+    otherwise fall back to a deterministic hash of the path string.
+    """
+    try:
+        if stat.S_ISREG(os.stat(path).st_mode):
+            return hash_file(path)
+    except FileNotFoundError:
+        pass
+    return hash_path(path)
@@ -4,17 +4,40 @@ from __future__ import annotations
 Managing API-keys (CLI + localhost).
 """
 
+import atexit
+import base64
 import hashlib
 import secrets
+import threading
+import time
 from datetime import datetime
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
-from sqlalchemy import select, update
+from sqlalchemy import case, insert, select, update
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
 
 from sda.auth.config import DEFAULT_STR
-from sda.db.session import get_session
+from sda.db.session import commit_or_flush, session_scope, use_session
 from sda.models.apikey import ApiKey
 
+# Pre-initialized context; copy() is cheaper than building a new one per key.
+_SHA256_TEMPLATE = hashlib.sha256()
+
+# Random bytes per key; matches secrets.token_urlsafe(32).
+_KEY_BYTES = 32
+
+# Batch size for streaming list_* helpers.
+_YIELD_PER = 1000
+
+# valid_api_key(s)() buffer last_used_at per key id and write them in one
+# UPDATE at most every _LAST_USED_FLUSH_S seconds (see flush_last_used());
+# whatever is still buffered is written at interpreter exit.
+_LAST_USED_FLUSH_S = 5.0
+_last_used: dict[int, datetime] = {}
+_last_flush: float = time.monotonic()
+_last_used_lock = threading.Lock()
+
 
 # ---------------------------------------------------------------------------
 # Internal helpers
@@ -24,18 +47,82 @@ def _hash_key(raw: str) -> str:
     """
     One-way hash of an API key. Only the hash is stored in DB.
     """
-    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    h = _SHA256_TEMPLATE.copy()
+    h.update(raw.encode("utf-8"))
+    return h.hexdigest()
 
 
 def _now() -> datetime:
     return datetime.utcnow()
 
 
+def _add_api_key(session: Session, user_id: int, name: str) -> Tuple[str, ApiKey]:
+    """
+    Stage a new ApiKey on the session without committing.
+    """
+    plain_key = secrets.token_urlsafe(32)
+    api = ApiKey(
+        user_id=user_id,
+        name=name,
+        key_hash=_hash_key(plain_key),
+        is_revoked=False,
+    )
+    session.add(api)
+    return plain_key, api
+
+
+def _record_last_used(session: Session, key_ids: Iterable[int]) -> None:
+    """
+    Buffer a last_used_at hit for `key_ids`; flush if the interval elapsed.
+    """
+    now = _now()
+    with _last_used_lock:
+        for key_id in key_ids:
+            _last_used[key_id] = now
+        due = time.monotonic() - _last_flush >= _LAST_USED_FLUSH_S
+    if due:
+        flush_last_used(session=session)
+
+
+def _flush_last_used_at_exit() -> None:
+    """
+    atexit hook: write buffered last_used_at values in a session of its own.
+    """
+    with _last_used_lock:
+        if not _last_used:
+            return
+    try:
+        with session_scope() as session:
+            flush_last_used(session=session)
+    except (RuntimeError, SQLAlchemyError):
+        # Engine not initialized or database gone; nothing left to retry with.
+        pass
+
+
+atexit.register(_flush_last_used_at_exit)
+
+
+def _plain_keys(n: int) -> list[str]:
+    """
+    Generate `n` URL-safe plain keys from a single CSPRNG read.
+    """
+    raw = secrets.token_bytes(_KEY_BYTES * n)
+    return [
+        base64.urlsafe_b64encode(raw[i:i + _KEY_BYTES]).rstrip(b"=").decode("ascii")
+        for i in range(0, len(raw), _KEY_BYTES)
+    ]
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def create_api_key(user_id: int, name: str = DEFAULT_STR) -> Tuple[str, ApiKey]:
+def create_api_key(
+    user_id: int,
+    name: str = DEFAULT_STR,
+    *,
+    session: Session | None = None,
+) -> Tuple[str, ApiKey]:
     """
     Create a single API key for a user.
 
@@ -43,26 +130,18 @@ def create_api_key(user_id: int, name: str = DEFAULT_STR) -> Tuple[str, ApiKey]:
         (plain_key, ApiKey ORM instance)
         - plain_key: the secret token (show it once, then store only hash).
     """
-    session = get_session()
-
-    plain_key = secrets.token_urlsafe(32)
-    key_hash = _hash_key(plain_key)
-
-    api = ApiKey(
-        user_id=user_id,
-        name=name,
-        key_hash=key_hash,
-        is_revoked=False,
-        created_at=_now(),
-    )
-    session.add(api)
-    session.commit()
-    session.refresh(api)
+    session = use_session(session)
+    plain_key, api = _add_api_key(session, user_id, name)
+    commit_or_flush(session)
 
     return plain_key, api
 
 
-def create_api_keys(*names: str, user_ids: List[str] | None = None) -> List[Tuple[str, ApiKey]]:
+def create_api_keys(
+    *names: str,
+    user_ids: List[str] | None = None,
+    session: Session | None = None,
+) -> List[Tuple[str, ApiKey]]:
     """
     Batch create API keys.
 
@@ -72,23 +151,46 @@ def create_api_keys(*names: str, user_ids: List[str] | None = None) -> List[Tupl
         - If user_ids has the same length as names:
             keys are created pairwise (names[i] for user_ids[i]).
         - Otherwise: ValueError.
-    """
-    if user_ids is None or len(user_ids) == 1:
-        if user_ids is None:
-            raise ValueError("create_api_keys requires `user_ids` when using batch mode.")
-        user_id = user_ids[0]
-        return [create_api_key(user_id=user_id, name=name) for name in names]
 
-    if len(user_ids) != len(names):
+    All keys are created with one multi-row INSERT and committed once.
+    """
+    if user_ids is None:
+        raise ValueError("create_api_keys requires `user_ids` when using batch mode.")
+
+    if len(user_ids) == 1:
+        pairs = [(user_ids[0], name) for name in names]
+    elif len(user_ids) == len(names):
+        pairs = list(zip(user_ids, names, strict=True))
+    else:
         raise ValueError("Length of user_ids must be 1 or equal to the number of names.")
 
-    out: List[Tuple[str, ApiKey]] = []
-    for user_id, name in zip(user_ids, names, strict=True):
-        out.append(create_api_key(user_id=user_id, name=name))
-    return out
-
-
-def get_api_key(key: str | None = None, user_id: int | None = None) -> Optional[ApiKey]:
+    if not pairs:
+        return []
+
+    session = use_session(session)
+    plain_keys = _plain_keys(len(pairs))
+    rows = session.scalars(
+        insert(ApiKey).returning(ApiKey, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": user_id,
+                "name": name,
+                "key_hash": _hash_key(plain),
+                "is_revoked": False,
+            }
+            for (user_id, name), plain in zip(pairs, plain_keys, strict=True)
+        ],
+    ).all()
+    commit_or_flush(session)
+    return list(zip(plain_keys, rows, strict=True))
+
+
+def get_api_key(
+    key: str | None = None,
+    user_id: int | None = None,
+    *,
+    session: Session | None = None,
+) -> Optional[ApiKey]:
     """
     Look up an API key by its *plain* value and optionally user_id.
 
@@ -97,7 +199,7 @@ def get_api_key(key: str | None = None, user_id: int | None = None) -> Optional[
     if key is None:
         return None
 
-    session = get_session()
+    session = use_session(session)
     key_hash = _hash_key(key)
 
     stmt = select(ApiKey).where(ApiKey.key_hash == key_hash)
@@ -108,7 +210,11 @@ def get_api_key(key: str | None = None, user_id: int | None = None) -> Optional[
     return api
 
 
-def get_api_keys(*user_ids: str, keys: List[str] | None = None) -> List[ApiKey]:
+def get_api_keys(
+    *user_ids: str,
+    keys: List[str] | None = None,
+    session: Session | None = None,
+) -> List[ApiKey]:
     """
     Batch lookup.
 
@@ -116,12 +222,10 @@ def get_api_keys(*user_ids: str, keys: List[str] | None = None) -> List[ApiKey]:
         - If `keys` is provided: return all matching ApiKey rows by key values.
         - Else: return all keys belonging to the given user_ids.
     """
-    session = get_session()
-
     if keys is not None:
-        hashes = [_hash_key(k) for k in keys]
-        stmt = select(ApiKey).where(ApiKey.key_hash.in_(hashes))
-        return list(session.scalars(stmt).all())
+        return list(map_api_keys(*keys, session=session).values())
+
+    session = use_session(session)
 
     if not user_ids:
         raise ValueError("get_api_keys requires at least one user_id or `keys`.")
@@ -130,25 +234,46 @@ def get_api_keys(*user_ids: str, keys: List[str] | None = None) -> List[ApiKey]:
     return list(session.scalars(stmt).all())
 
 
-def list_api_for_one(user_id: int) -> List[ApiKey]:
+def map_api_keys(*keys: str, session: Session | None = None) -> dict[str, ApiKey]:
+    """
+    Look up API keys by *plain* value and map each found key to its row.
+
+    Duplicate keys are hashed and queried once; keys without a row are
+    left out of the result.
+    """
+    hash_to_key: dict[str, str] = {}
+    for key in keys:
+        hash_to_key.setdefault(_hash_key(key), key)
+    if not hash_to_key:
+        return {}
+
+    session = use_session(session)
+    stmt = select(ApiKey).where(ApiKey.key_hash.in_(hash_to_key))
+    return {hash_to_key[api.key_hash]: api for api in session.scalars(stmt)}
+
+
+def list_api_for_one(user_id: int, *, session: Session | None = None) -> List[ApiKey]:
     """
     List all API keys for a single user (revoked and active).
     """
-    session = get_session()
+    session = use_session(session)
     stmt = select(ApiKey).where(ApiKey.user_id == user_id)
     return list(session.scalars(stmt).all())
 
 
-def list_api_for_all() -> List[ApiKey]:
+def list_api_for_all(*, session: Session | None = None) -> Iterator[ApiKey]:
     """
-    List all API keys for all users.
+    Stream all API keys for all users.
+
+    Rows are fetched through a server-side cursor in batches of
+    _YIELD_PER; wrap in list() if a materialized list is required.
     """
-    session = get_session()
+    session = use_session(session)
     stmt = select(ApiKey)
-    return list(session.scalars(stmt).all())
+    yield from session.scalars(stmt, execution_options={"yield_per": _YIELD_PER})
 
 
-def revoke_api_key(key: str | None = None) -> bool:
+def revoke_api_key(key: str | None = None, *, session: Session | None = None) -> bool:
     """
     Revoke a single API key by its *plain* value.
 
@@ -158,7 +283,7 @@ def revoke_api_key(key: str | None = None) -> bool:
     if key is None:
         return False
 
-    session = get_session()
+    session = use_session(session)
     key_hash = _hash_key(key)
 
     api = session.scalar(select(ApiKey).where(ApiKey.key_hash == key_hash))
@@ -166,25 +291,40 @@ def revoke_api_key(key: str | None = None) -> bool:
         return False
 
     api.is_revoked = True
-    session.commit()
+    commit_or_flush(session)
     return True
 
 
-def revoke_api_keys(*keys: str) -> int:
+def revoke_api_keys(*keys: str, session: Session | None = None) -> int:
     """
     Batch revoke keys by plain value.
 
+    Issues a single UPDATE for all keys instead of one round-trip per key.
+
     Returns:
         number of keys successfully revoked.
     """
-    count = 0
-    for key in keys:
-        if revoke_api_key(key):
-            count += 1
-    return count
+    if not keys:
+        return 0
+
+    session = use_session(session)
+    hashes = {_hash_key(k) for k in keys}
 
+    stmt = (
+        update(ApiKey)
+        .where(ApiKey.key_hash.in_(hashes), ApiKey.is_revoked.is_(False))
+        .values(is_revoked=True)
+    )
+    result = session.execute(stmt)
+    commit_or_flush(session)
+    return result.rowcount
 
-def rotate_api_key(key: str | None = None) -> Optional[Tuple[str, ApiKey]]:
+
+def rotate_api_key(
+    key: str | None = None,
+    *,
+    session: Session | None = None,
+) -> Optional[Tuple[str, ApiKey]]:
     """
     Rotate a single key: revoke old, create a new one for the same user and name.
 
@@ -194,7 +334,7 @@ def rotate_api_key(key: str | None = None) -> Optional[Tuple[str, ApiKey]]:
     if key is None:
         return None
 
-    session = get_session()
+    session = use_session(session)
     key_hash = _hash_key(key)
 
     api = session.scalar(select(ApiKey).where(ApiKey.key_hash == key_hash))
@@ -203,57 +343,136 @@ def rotate_api_key(key: str | None = None) -> Optional[Tuple[str, ApiKey]]:
 
     # Revoke old
     api.is_revoked = True
-    session.commit()
+    commit_or_flush(session)
 
     # Create new with same user_id and name
-    return create_api_key(user_id=api.user_id, name=api.name)
+    return create_api_key(user_id=api.user_id, name=api.name, session=session)
 
 
-def rotate_api_keys(*keys: str) -> List[Tuple[str, ApiKey]]:
+def rotate_api_keys(*keys: str, session: Session | None = None) -> List[Tuple[str, ApiKey]]:
     """
     Batch rotate keys.
 
+    Old keys are revoked with one UPDATE and replacements are created with
+    one multi-row INSERT, all in a single transaction.
+
     Returns:
         list of (new_plain_key, new_ApiKey); missing/invalid old keys are skipped.
     """
-    out: List[Tuple[str, ApiKey]] = []
-    for key in keys:
-        result = rotate_api_key(key)
-        if result is not None:
-            out.append(result)
-    return out
+    if not keys:
+        return []
+
+    session = use_session(session)
+    hashes = {_hash_key(k) for k in keys}
 
+    stmt = select(ApiKey).where(ApiKey.key_hash.in_(hashes), ApiKey.is_revoked.is_(False))
+    old_rows = list(session.scalars(stmt).all())
+    if not old_rows:
+        return []
 
-def valid_api_key(key: str | None = None) -> bool:
+    session.execute(
+        update(ApiKey)
+        .where(ApiKey.id.in_([row.id for row in old_rows]))
+        .values(is_revoked=True)
+    )
+
+    plain_keys = _plain_keys(len(old_rows))
+    new_rows = session.scalars(
+        insert(ApiKey).returning(ApiKey, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": row.user_id,
+                "name": row.name,
+                "key_hash": _hash_key(plain),
+                "is_revoked": False,
+            }
+            for row, plain in zip(old_rows, plain_keys, strict=True)
+        ],
+    ).all()
+    commit_or_flush(session)
+
+    return list(zip(plain_keys, new_rows, strict=True))
+
+
+def valid_api_key(key: str | None = None, *, session: Session | None = None) -> bool:
     """
     Check if a plain key is valid (exists and not revoked).
     """
     if key is None:
         return False
 
-    api = get_api_key(key)
+    session = use_session(session)
+    api = get_api_key(key, session=session)
     if api is None:
         return False
     if api.is_revoked:
         return False
 
-    # Optional: update last_used_at for localhost tracking
-    session = get_session()
-    api.last_used_at = _now()
-    session.commit()
-
+    # Track last_used_at for localhost auditing; written in batches.
+    _record_last_used(session, [api.id])
     return True
 
 
-def valid_api_keys(*keys: str) -> dict[str, bool]:
+def flush_last_used(*, session: Session | None = None) -> int:
+    """
+    Write buffered last_used_at timestamps with a single UPDATE.
+
+    Also runs at interpreter exit. Entries leave the buffer only after the
+    write succeeded, so a failed flush is retried by the next one.
+
+    Returns:
+        number of keys whose timestamp was written.
+    """
+    global _last_flush
+
+    with _last_used_lock:
+        pending = dict(_last_used)
+        _last_flush = time.monotonic()
+    if not pending:
+        return 0
+
+    session = use_session(session)
+    session.execute(
+        update(ApiKey)
+        .where(ApiKey.id.in_(pending))
+        .values(last_used_at=case(pending, value=ApiKey.id))
+    )
+    commit_or_flush(session)
+
+    # Hits recorded while writing carry a newer timestamp and stay buffered.
+    with _last_used_lock:
+        for key_id, used_at in pending.items():
+            if _last_used.get(key_id) == used_at:
+                del _last_used[key_id]
+    return len(pending)
+
+
+def valid_api_keys(*keys: str, session: Session | None = None) -> dict[str, bool]:
     """
     Batch validity check.
 
+    Uses one SELECT for all keys; last_used_at of the valid ones is
+    buffered and written like in valid_api_key().
+
     Returns:
         dict: {plain_key: is_valid}
     """
-    results: dict[str, bool] = {}
-    for key in keys:
-        results[key] = valid_api_key(key)
+    results: dict[str, bool] = {key: False for key in keys}
+    if not keys:
+        return results
+
+    session = use_session(session)
+    hash_to_key = {_hash_key(k): k for k in results}
+
+    stmt = select(ApiKey.id, ApiKey.key_hash).where(
+        ApiKey.key_hash.in_(hash_to_key), ApiKey.is_revoked.is_(False)
+    )
+    valid_ids = []
+    for key_id, key_hash in session.execute(stmt):
+        results[hash_to_key[key_hash]] = True
+        valid_ids.append(key_id)
+
+    if valid_ids:
+        _record_last_used(session, valid_ids)
     return results
 
@@ -4,27 +4,21 @@ from __future__ import annotations
 Scene-linked file assets (ZIP, JP2, TIF).
 """
 
-from datetime import datetime
-from pathlib import Path
-from typing import Optional
+from typing import Any, Iterator, Optional
 
-from sqlalchemy import select
+from sqlalchemy import exists, select, tuple_
+from sqlalchemy.orm import Session
 
-from sda.db.session import get_session
+from sda.db._hashing import hash_file_or_path
+from sda.db.paths import get_or_create_path, intern_paths
+from sda.db.session import commit_or_flush, upsert_insert, use_session
 from sda.models.scene_asset import SceneAsset
 
-import hashlib
+# Batch size for streaming list_* helpers.
+_YIELD_PER = 1000
 
-
-def _hash_file_or_path(path: str) -> str:
-    """
-    Return the SHA256 of file contents when the file exists,
-    otherwise fall back to a deterministic hash of the path string.
-    """
-    candidate = Path(path)
-    if candidate.is_file():
-        return hashlib.sha256(candidate.read_bytes()).hexdigest()
-    return hashlib.sha256(path.encode("utf-8")).hexdigest()
+# Natural key of a SceneAsset row (uq_asset_scene_kind_res).
+_ASSET_KEY = ("scene_id", "kind", "resolution_m")
 
 
 def register_asset(
@@ -35,11 +29,17 @@ def register_asset(
     path: str,
     *,
     is_resampled: bool = False,
-    sha256: str | None = None,
+    sha256: bytes | str | None = None,
+    session: Session | None = None,
 ) -> SceneAsset:
     """
     Create a SceneAsset row for a file tied to a Scene.
 
+    An already registered (scene_id, kind, resolution_m) is returned
+    unchanged, before its path is interned or its file hashed. Otherwise
+    one INSERT ... ON CONFLICT DO NOTHING writes the row, so a concurrent
+    registration of the same key still resolves to a single row.
+
     Args:
         scene_id     – internal Scene primary key.
         kind         – asset name (e.g. "B04_10m", "SCL_20m", "NDVI_10m").
@@ -47,7 +47,9 @@ def register_asset(
         dtype        – data type label (e.g. "uint16", "uint8", "float32").
         path         – filesystem or object-store path to the asset.
         is_resampled – True if the asset was resampled from its native grid.
-        sha256       – optional precomputed content hash; computed from file if omitted.
+        sha256       – optional precomputed digest (32 raw bytes or hex);
+                       computed from file if omitted.
+        session      – optional session to use instead of the context-local one.
     """
     if not scene_id:
         raise ValueError("register_asset(): scene_id must be a positive integer.")
@@ -60,45 +62,137 @@ def register_asset(
     if not path:
         raise ValueError("register_asset(): path is required.")
 
-    session = get_session()
-    asset = SceneAsset(
-        scene_id=scene_id,
-        kind=kind,
-        resolution_m=resolution_m,
-        dtype=dtype,
-        path=path,
-        sha256=sha256 or _hash_file_or_path(path),
-        is_resampled=is_resampled,
-        created_at=datetime.utcnow(),
+    session = use_session(session)
+    by_key = select(SceneAsset).where(
+        SceneAsset.scene_id == scene_id,
+        SceneAsset.kind == kind,
+        SceneAsset.resolution_m == resolution_m,
     )
-    session.add(asset)
-    session.commit()
-    session.refresh(asset)
+    asset = session.scalar(by_key)
+    if asset is not None:
+        return asset
+
+    stmt = (
+        upsert_insert(session, SceneAsset, "register_asset")
+        .values(
+            scene_id=scene_id,
+            kind=kind,
+            resolution_m=resolution_m,
+            dtype=dtype,
+            path_id=get_or_create_path(session, path),
+            sha256=sha256 or hash_file_or_path(path),
+            is_resampled=is_resampled,
+        )
+        .on_conflict_do_nothing(index_elements=list(_ASSET_KEY))
+        .returning(SceneAsset)
+    )
+    # None only if a concurrent registration won the race.
+    asset = session.scalar(stmt) or session.scalar(by_key)
+    commit_or_flush(session)
     return asset
 
 
-def list_assets_one(scene_id: int) -> list[SceneAsset]:
+def register_assets(
+    rows: list[dict[str, Any]],
+    *,
+    session: Session | None = None,
+) -> list[SceneAsset]:
+    """
+    Create many SceneAsset rows with one multi-row INSERT and a single commit.
+
+    Each row is a dict of register_asset() arguments (scene_id, kind,
+    resolution_m, dtype, path, and optionally is_resampled / sha256).
+    Missing hashes are computed from the file, as in register_asset().
+    Already registered (scene_id, kind, resolution_m) keys are read with
+    one SELECT up front and skipped, so their paths are neither interned
+    nor hashed; the remaining rows go through one INSERT ... ON CONFLICT
+    DO NOTHING ... RETURNING (the first row wins for a key repeated in
+    `rows`).
+
+    Returns:
+        SceneAsset instances (new or already registered), in the order of `rows`.
+    """
+    if not rows:
+        return []
+
+    for row in rows:
+        for field in ("scene_id", "kind", "resolution_m", "dtype", "path"):
+            if not row.get(field):
+                raise ValueError(f"register_assets(): {field} is required.")
+
+    session = use_session(session)
+    keys = [(int(row["scene_id"]), row["kind"], int(row["resolution_m"])) for row in rows]
+    key_cols = tuple_(SceneAsset.scene_id, SceneAsset.kind, SceneAsset.resolution_m)
+    stmt = select(SceneAsset).where(key_cols.in_(set(keys)))
+    by_key = {(a.scene_id, a.kind, a.resolution_m): a for a in session.scalars(stmt)}
+
+    new_rows: dict[tuple[int, str, int], dict[str, Any]] = {}
+    for key, row in zip(keys, rows):
+        if key not in by_key:
+            new_rows.setdefault(key, row)
+    if not new_rows:
+        return [by_key[key] for key in keys]
+
+    path_ids = intern_paths(session, [row["path"] for row in new_rows.values()])
+    params = []
+    for row, path_id in zip(new_rows.values(), path_ids, strict=True):
+        param = {
+            "is_resampled": False,
+            **row,
+            "path_id": path_id,
+            "sha256": row.get("sha256") or hash_file_or_path(row["path"]),
+        }
+        del param["path"]
+        params.append(param)
+
+    stmt = (
+        upsert_insert(session, SceneAsset, "register_assets")
+        .on_conflict_do_nothing(index_elements=list(_ASSET_KEY))
+        .returning(SceneAsset)
+    )
+    for a in session.scalars(stmt, params):
+        by_key[(a.scene_id, a.kind, a.resolution_m)] = a
+
+    # Keys a concurrent registration won in the meantime.
+    raced = {key for key in keys if key not in by_key}
+    if raced:
+        stmt = select(SceneAsset).where(key_cols.in_(raced))
+        for a in session.scalars(stmt):
+            by_key[(a.scene_id, a.kind, a.resolution_m)] = a
+    commit_or_flush(session)
+    return [by_key[key] for key in keys]
+
+
+def list_assets_one(scene_id: int, *, session: Session | None = None) -> list[SceneAsset]:
     """
     Return all assets for a single Scene.
     """
     if not scene_id:
         raise ValueError("list_assets_one(): scene_id must be a positive integer.")
 
-    session = get_session()
+    session = use_session(session)
     stmt = select(SceneAsset).where(SceneAsset.scene_id == scene_id)
     return list(session.scalars(stmt).all())
 
 
-def list_assets_all() -> list[SceneAsset]:
+def list_assets_all(*, session: Session | None = None) -> Iterator[SceneAsset]:
     """
-    Return all assets across all scenes.
+    Stream all assets across all scenes.
+
+    Rows are fetched through a server-side cursor in batches of
+    _YIELD_PER; wrap in list() if a materialized list is required.
     """
-    session = get_session()
+    session = use_session(session)
     stmt = select(SceneAsset)
-    return list(session.scalars(stmt).all())
+    yield from session.scalars(stmt, execution_options={"yield_per": _YIELD_PER})
 
 
-def get_asset(scene_id: int, kind: str) -> Optional[SceneAsset]:
+def get_asset(
+    scene_id: int,
+    kind: str,
+    *,
+    session: Session | None = None,
+) -> Optional[SceneAsset]:
     """
     Return a single asset by scene_id and kind.
     """
@@ -107,23 +201,36 @@ def get_asset(scene_id: int, kind: str) -> Optional[SceneAsset]:
     if not kind:
         raise ValueError("get_asset(): kind is required.")
 
-    session = get_session()
+    session = use_session(session)
     stmt = select(SceneAsset).where(
         (SceneAsset.scene_id == scene_id) & (SceneAsset.kind == kind)
     )
     return session.scalar(stmt)
 
 
-def exists_asset(scene_id: int, kind: str) -> bool:
+def exists_asset(scene_id: int, kind: str, *, session: Session | None = None) -> bool:
     """
     Return True if an asset exists for the given scene_id and kind.
+
+    Uses SELECT EXISTS(...) so no SceneAsset row is loaded.
     """
-    return get_asset(scene_id, kind) is not None
+    if not scene_id:
+        raise ValueError("exists_asset(): scene_id must be a positive integer.")
+    if not kind:
+        raise ValueError("exists_asset(): kind is required.")
+
+    session = use_session(session)
+    stmt = select(
+        exists().where((SceneAsset.scene_id == scene_id) & (SceneAsset.kind == kind))
+    )
+    return bool(session.scalar(stmt))
 
 
 def delete_asset(
     asset_id: int | None = None,
     params: dict[str, str] | None = None,
+    *,
+    session: Session | None = None,
 ) -> bool:
     """
     Delete a single asset by ID or by filter params.
@@ -132,14 +239,14 @@ def delete_asset(
         - scene_id
         - kind
     """
-    session = get_session()
+    session = use_session(session)
 
     if asset_id is not None:
         asset = session.get(SceneAsset, asset_id)
         if asset is None:
             return False
         session.delete(asset)
-        session.commit()
+        commit_or_flush(session)
         return True
 
     if not params:
@@ -157,6 +264,6 @@ def delete_asset(
     if asset is None:
         return False
     session.delete(asset)
-    session.commit()
+    commit_or_flush(session)
     return True
 
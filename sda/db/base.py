@@ -4,13 +4,73 @@ from __future__ import annotations
 ORM and schema initialization.
 """
 
+from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import text
+from sqlalchemy import (
+    JSON,
+    BigInteger,
+    CheckConstraint,
+    DateTime,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.engine import Engine
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.types import TypeDecorator
 
 from sda.db.engine import get_engine
+from sda.db.health import clear_table_cache
+
+# JSON document column type: binary, GIN-indexable JSONB on PostgreSQL
+# (parsed once on write, not on every read), plain JSON elsewhere.
+JSONDoc = JSON().with_variant(JSONB(), "postgresql")
+
+# Surrogate key type for tables that grow with ingest volume: BIGINT, but
+# INTEGER on SQLite, where only an INTEGER PRIMARY KEY autoincrements.
+BigIntKey = BigInteger().with_variant(Integer, "sqlite")
+
+# Key type for small dimension tables (a few dozen rows): SMALLINT, INTEGER
+# on SQLite for the same reason as BigIntKey.
+SmallIntKey = SmallInteger().with_variant(Integer, "sqlite")
+
+
+class SHA256Digest(TypeDecorator):
+    """
+    Raw 32-byte SHA-256 digest (BYTEA on PostgreSQL).
+
+    Half the size of a 64-char hex string in both the row and its index.
+    Hex strings are still accepted on write and decoded once; reads
+    always return bytes.
+    """
+    impl = LargeBinary(32)
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, str):
+            return bytes.fromhex(value)
+        return value
+
+
+def bbox_constraints(table: str) -> tuple[CheckConstraint, ...]:
+    """
+    CHECK constraints for a (lon_min, lat_min, lon_max, lat_max) bbox:
+    min <= max on both axes and WGS84 ranges.
+
+    Rejects inverted or out-of-range envelopes at ingest, and gives the
+    planner the ordering to reason about bbox predicates. A new set is
+    built per table, since constraint objects cannot be shared.
+    """
+    return (
+        CheckConstraint("lon_min <= lon_max", name=f"ck_{table}_lon_order"),
+        CheckConstraint("lat_min <= lat_max", name=f"ck_{table}_lat_order"),
+        CheckConstraint("lon_min >= -180 AND lon_max <= 180", name=f"ck_{table}_lon_range"),
+        CheckConstraint("lat_min >= -90 AND lat_max <= 90", name=f"ck_{table}_lat_range"),
+    )
 
 
 class Base(DeclarativeBase):
@@ -27,11 +87,29 @@ class Base(DeclarativeBase):
     pass
 
 
+class CreatedAtMixin:
+    """
+    created_at set by the database on insert.
+    """
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
+class TimestampMixin(CreatedAtMixin):
+    """
+    created_at plus updated_at, which the UPDATE statement itself refreshes
+    (onupdate renders now() in SQL, no Python-side value).
+    """
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+
 def init_db(engine: Engine) -> None:
     """
     Create all tables defined on the Base metadata using the given engine.
     """
     Base.metadata.create_all(bind=engine)
+    clear_table_cache()
 
 
 def drop_db(engine: Engine) -> None:
@@ -39,6 +117,7 @@ def drop_db(engine: Engine) -> None:
     Drop all tables defined on the Base metadata using the given engine.
     """
     Base.metadata.drop_all(bind=engine)
+    clear_table_cache()
 
 
 def create_all(engine: Optional[Engine] = None) -> None:
@@ -50,6 +129,7 @@ def create_all(engine: Optional[Engine] = None) -> None:
     if engine is None:
         engine = get_engine()
     Base.metadata.create_all(bind=engine)
+    clear_table_cache()
 
 
 def drop_all(engine: Optional[Engine] = None) -> None:
@@ -61,6 +141,7 @@ def drop_all(engine: Optional[Engine] = None) -> None:
     if engine is None:
         engine = get_engine()
     Base.metadata.drop_all(bind=engine)
+    clear_table_cache()
 
 
 def init_code(sql: str, engine: Optional[Engine] = None) -> None:
@@ -4,21 +4,30 @@ from __future__ import annotations
 Change-detection (ΔNDVI, ΔNBR, masks)
 """
 
-from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, select
+from sqlalchemy.orm import selectinload
 
-from sda.db.session import get_session
+from sda.db.labels import get_or_create_label
+from sda.db.paths import get_or_create_path
+from sda.db.session import commit_or_flush, get_session, upsert_insert
 from sda.models.change import Change
+from sda.models.label import ChangeMethod, IndexName
 
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Statements (built once, executed with bind parameters)
 # ---------------------------------------------------------------------------
 
-def _now() -> datetime:
-    return datetime.utcnow()
+_LIST_CHANGES_FOR_SCENE = (
+    select(Change)
+    .where(
+        (Change.scene_before_id == bindparam("scene_id"))
+        | (Change.scene_after_id == bindparam("scene_id"))
+    )
+    .options(selectinload(Change.scene_before), selectinload(Change.scene_after))
+)
 
 
 # ---------------------------------------------------------------------------
@@ -32,7 +41,7 @@ def register_change(
     method: str,
     thresholds: dict[str, Any],
     path: str,
-    sha256: str,
+    sha256: bytes | str,
     ) -> Change:
     """
     Register a single change-detection artifact.
@@ -44,7 +53,12 @@ def register_change(
         method          – computation method (e.g. "diff", "zscore", "seasonal").
         thresholds      – JSON-ready threshold settings for masks or alerts.
         path            – filesystem or object-storage path of the artifact.
-        sha256          – content hash of the artifact for integrity checks.
+        sha256          – SHA-256 digest of the artifact (32 raw bytes or hex).
+
+    A change already registered for the same (scene pair, index_name,
+    method) is returned unchanged, before its path is interned. New rows
+    are written with INSERT ... ON CONFLICT DO NOTHING, so a concurrent
+    registration of the same key still resolves to one row.
     """
     if not scene_before_id or not scene_after_id:
         raise ValueError("register_change(): scene ids required")
@@ -52,21 +66,37 @@ def register_change(
         raise ValueError("register_change(): missing required fields")
 
     session = get_session()
-
-    change = Change(
-        scene_before_id=scene_before_id,
-        scene_after_id=scene_after_id,
-        index_name=index_name,
-        method=method,
-        thresholds=thresholds,
-        path=path,
-        sha256=sha256,
-        created_at=_now(),
+    index_id = get_or_create_label(session, IndexName, index_name)
+    method_id = get_or_create_label(session, ChangeMethod, method)
+    by_key = select(Change).where(
+        Change.scene_before_id == scene_before_id,
+        Change.scene_after_id == scene_after_id,
+        Change.index_id == index_id,
+        Change.method_id == method_id,
     )
-
-    session.add(change)
-    session.commit()
-    session.refresh(change)
+    change = session.scalar(by_key)
+    if change is not None:
+        return change
+
+    stmt = (
+        upsert_insert(session, Change, "register_change")
+        .values(
+            scene_before_id=scene_before_id,
+            scene_after_id=scene_after_id,
+            index_id=index_id,
+            method_id=method_id,
+            thresholds=thresholds,
+            path_id=get_or_create_path(session, path),
+            sha256=sha256,
+        )
+        .on_conflict_do_nothing(
+            index_elements=["scene_before_id", "scene_after_id", "index_id", "method_id"]
+        )
+        .returning(Change)
+    )
+    # None only if a concurrent registration won the race.
+    change = session.scalar(stmt) or session.scalar(by_key)
+    commit_or_flush(session)
     return change
 
 
@@ -87,13 +117,11 @@ def get_change(change_id: int) -> Optional[Change]:
 def list_changes_for_scene(scene_id: int) -> list[Change]:
     """
     List all change artifacts where the given scene is either before or after.
+
+    scene_before / scene_after are loaded up front with one IN query each.
     """
     session = get_session()
-    stmt = select(Change).where(
-        (Change.scene_before_id == scene_id)
-        | (Change.scene_after_id == scene_id)
-    )
-    return list(session.scalars(stmt).all())
+    return session.scalars(_LIST_CHANGES_FOR_SCENE, {"scene_id": scene_id}).all()
 
 def delete_change(change_id: int) -> bool:
     """
@@ -103,9 +131,7 @@ def delete_change(change_id: int) -> bool:
         True if the row existed and was deleted, False otherwise.
     """
     session = get_session()
-    obj = session.get(Change, change_id)
-    if obj is None:
-        return False
-    session.delete(obj)
-    session.commit()
-    return True
+    stmt = delete(Change).where(Change.id == change_id).returning(Change.id)
+    deleted = session.execute(stmt).first() is not None
+    commit_or_flush(session)
+    return deleted
@@ -4,10 +4,11 @@ from __future__ import annotations
 Trash and old data cleanup.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import select, text
+from sqlalchemy import delete, select, text
+from sqlalchemy.exc import SQLAlchemyError
 
 from sda.auth.config import DEFAULT_STR
 from sda.db.engine import get_engine
@@ -17,6 +18,9 @@ from sda.models.index_artifact import IndexArtifact
 from sda.models.index_feature import IndexFeature
 from sda.models.change import Change
 
+# Maximum rows removed per DELETE statement in _cleanup_old_runs().
+_DELETE_BATCH_SIZE = 10_000
+
 
 def cleanup(params: dict[str, Any]) -> Dict[str, int]:
     """
@@ -56,44 +60,51 @@ def _cleanup_failed_runs() -> int:
     """
     Delete runs with status 'failed' or 'killed'.
 
+    Issued as a single DELETE statement; no Run rows are loaded.
+
     Returns:
         number of runs deleted.
     """
     session = get_session()
 
-    q = session.query(Run).filter(Run.status.in_(["failed", "killed"]))
-    runs = q.all()
-    count = len(runs)
-
-    for run in runs:
-        session.delete(run)
+    stmt = delete(Run).where(Run.status.in_(["failed", "killed"]))
+    count = session.execute(stmt).rowcount
 
     session.commit()
     return count
 
 
-def _cleanup_old_runs(days: int) -> int:
+def _cleanup_old_runs(days: int, batch_size: int = _DELETE_BATCH_SIZE) -> int:
     """
     Delete old runs (and implicitly any dependent data if cascades are configured).
 
     Deletes runs whose finished_at is older than `days`. If finished_at is null,
     status must be terminal to be deleted.
+
+    Rows are deleted in id batches of `batch_size`, committing after each
+    batch, so transactions and locks stay short on large tables.
     """
     session = get_session()
-    cutoff = datetime.utcnow() - timedelta(days=days)
-
-    q = (
-        session.query(Run)
-        .filter(Run.finished_at.isnot(None))
-        .filter(Run.finished_at < cutoff)
+    # finished_at is written by the DB clock (func.now()) as timestamptz.
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+    batch_ids = (
+        select(Run.id)
+        .where(Run.finished_at.isnot(None))
+        .where(Run.finished_at < cutoff)
+        .limit(batch_size)
+        .scalar_subquery()
     )
-    runs = q.all()
-    count = len(runs)
+    stmt = delete(Run).where(Run.id.in_(batch_ids))
 
-    for run in runs:
-        session.delete(run)
+    count = 0
+    while True:
+        deleted = session.execute(stmt).rowcount
+        session.commit()
+        if not deleted:
+            break
+        count += deleted
 
-    session.commit()
     return count
 
 
@@ -102,7 +113,7 @@ def vacuum_tables(
     *,
     full: bool = False,
     analyze: bool = True,
-) -> None:
+) -> List[str]:
     """
     Run PostgreSQL VACUUM on selected tables (or on the whole DB if table_names is None).
 
@@ -111,9 +122,13 @@ def vacuum_tables(
         full        – use VACUUM FULL (heavier, locks tables).
         analyze     – include ANALYZE to update planner statistics.
 
+    Returns:
+        names of tables whose VACUUM failed; the remaining tables are still processed.
+
     Notes:
         - Requires PostgreSQL.
         - Executed in AUTOCOMMIT mode because VACUUM cannot run inside a transaction.
+        - Table names are quoted as identifiers, never interpolated raw.
     """
     engine = get_engine()
 
@@ -127,14 +142,19 @@ def vacuum_tables(
     if options:
         opt_str = " (" + ", ".join(options) + ")"
 
-    if table_names:
-        target = ", ".join(table_names)
-    else:
-        target = ""  # vacuum entire DB
+    failed: List[str] = []
 
-    sql = f"VACUUM{opt_str} {target};"
-
-    # VACUUM must run outside a transaction
+    # VACUUM must run outside a transaction; one connection serves all tables.
     with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
-        conn.execute(text(sql))
-
+        if not table_names:
+            conn.execute(text(f"VACUUM{opt_str}"))  # vacuum entire DB
+            return failed
+
+        quote = conn.dialect.identifier_preparer.quote
+        for name in table_names:
+            try:
+                conn.execute(text(f"VACUUM{opt_str} {quote(name)}"))
+            except SQLAlchemyError:
+                failed.append(name)
+
+    return failed
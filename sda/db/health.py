@@ -4,14 +4,38 @@ from __future__ import annotations
 Diagnostics.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
 
-from sqlalchemy import MetaData, Table, func, select, inspect
+from sqlalchemy import func, select, inspect, table
+from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 
 from sda.auth.config import DEFAULT_STR
 from sda.db.engine import get_engine, ping_db
 
+# (engine, table names) from the last catalog lookup; see _table_names().
+_TABLE_NAMES: Optional[Tuple[Engine, FrozenSet[str]]] = None
+
+
+def clear_table_cache() -> None:
+    """
+    Forget cached table names; called after schema create/drop.
+    """
+    global _TABLE_NAMES
+    _TABLE_NAMES = None
+
+
+def _table_names(engine: Engine, *, refresh: bool = False) -> FrozenSet[str]:
+    """
+    Return table names for `engine`, querying the catalog only when the
+    cache is empty, bound to another engine, or `refresh` is set.
+    """
+    global _TABLE_NAMES
+
+    if refresh or _TABLE_NAMES is None or _TABLE_NAMES[0] is not engine:
+        _TABLE_NAMES = (engine, frozenset(inspect(engine).get_table_names()))
+    return _TABLE_NAMES[1]
+
 
 def db_healthcheck() -> bool:
     """
@@ -41,16 +65,15 @@ def count_rows(table_name: str) -> int:
         raise ValueError(DEFAULT_STR)
 
     engine = get_engine()
-    inspector = inspect(engine)
-
-    if table_name not in inspector.get_table_names():
-        raise ValueError(f"Unknown table: {table_name!r}")
 
-    metadata = MetaData()
-    table = Table(table_name, metadata, autoload_with=engine)
+    if table_name not in _table_names(engine):
+        # Re-check the catalog once on a miss in case the table is new.
+        if table_name not in _table_names(engine, refresh=True):
+            raise ValueError(f"Unknown table: {table_name!r}")
 
+    # A lightweight table() clause quotes the name without reflecting columns.
     with engine.connect() as conn:
-        stmt = select(func.count()).select_from(table)
+        stmt = select(func.count()).select_from(table(table_name))
         return conn.execute(stmt).scalar_one()
 
 
@@ -68,7 +91,6 @@ def db_info() -> Dict[str, Any]:
         }
     """
     engine = get_engine()
-    inspector = inspect(engine)
 
     # redact password from URL
     safe_url = engine.url.set(password="***")
@@ -78,7 +100,7 @@ def db_info() -> Dict[str, Any]:
         "dialect": engine.dialect.name,
         "driver": engine.dialect.driver,
         "url": str(safe_url),
-        "tables": inspector.get_table_names(),
+        "tables": sorted(_table_names(engine)),
     }
 
     try:
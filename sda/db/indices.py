@@ -5,39 +5,84 @@ Store all the valuable features from the Sentinel-1/2 data.
 
 IndexArtifact – describes a stored index artifact (e.g. NDVI GeoTIFF for a scene).
 IndexFeature  – describes scalar features extracted from an artifact (e.g. mean NDVI).
+IndexFeatureSet – the same features of one artifact as a single JSON object.
 """
 
-from datetime import datetime
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Iterable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, delete, func, insert, select, true, tuple_, update
+from sqlalchemy.orm import Session, selectinload
 
-from sda.db.session import get_session
+from sda.db._hashing import hash_file_or_path
+from sda.db.paths import get_or_create_path, intern_paths
+from sda.db.session import commit_or_flush, get_session, upsert_insert
 from sda.models.index_artifact import IndexArtifact
-from sda.models.index_feature import IndexFeature 
+from sda.models.index_feature import IndexFeature
+from sda.models.index_feature_set import IndexFeatureSet
 
-import hashlib
+# Upper bound on threads used to hash files in register_index_paths().
+_HASH_WORKERS = 8
+
+# Natural key of an IndexArtifact row (uq_artifact_scene_index_res).
+_ARTIFACT_KEY = ("scene_id", "index_name", "resolution_m")
+
+# Columns written by copy_index_values(); created_at uses the server default.
+_COPY_COLUMNS = ("artifact_id", "key", "value", "units")
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Statements (built once, executed with bind parameters)
 # ---------------------------------------------------------------------------
 
-def _now() -> datetime:
-    return datetime.utcnow()
+# get_indices() variants keyed by (scene_id is set, index_name is set)
+_GET_INDICES = {
+    (False, False): select(IndexArtifact),
+    (True, False): select(IndexArtifact).where(IndexArtifact.scene_id == bindparam("scene_id")),
+    (False, True): select(IndexArtifact).where(IndexArtifact.index_name == bindparam("index_name")),
+    (True, True): select(IndexArtifact).where(
+        IndexArtifact.scene_id == bindparam("scene_id"),
+        IndexArtifact.index_name == bindparam("index_name"),
+    ),
+}
+
+_LIST_INDICES_ONE = (
+    select(IndexArtifact)
+    .where(IndexArtifact.scene_id == bindparam("scene_id"))
+    .options(selectinload(IndexArtifact.features))
+)
+
+_GET_INDEX_VALUES = select(IndexFeature).where(IndexFeature.artifact_id == bindparam("artifact_id"))
+_GET_INDEX_VALUES_BY_KEYS = _GET_INDEX_VALUES.where(
+    IndexFeature.key.in_(bindparam("keys", expanding=True))
+)
+
+_GET_INDEX_FEATURES = select(IndexFeatureSet.features).where(
+    IndexFeatureSet.artifact_id == bindparam("artifact_id")
+)
 
-def _hash_path(path: str) -> str:
-    return hashlib.sha256(path.encode("utf-8")).hexdigest()
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
 
-def _hash_file_or_path(path: str) -> str:
+def _merge_feature_set(session: Session, artifact_id: int, values: dict[str, float], caller: str) -> None:
     """
-    Return the SHA256 of file contents when the file exists,
-    otherwise fall back to a deterministic hash of the path string.
+    Merge `values` into the artifact's IndexFeatureSet with one
+    INSERT ... ON CONFLICT (artifact_id) DO UPDATE; existing keys are
+    overwritten, other keys are kept.
     """
-    candidate = Path(path)
-    if candidate.is_file():
-        return hashlib.sha256(candidate.read_bytes()).hexdigest()
-    return _hash_path(path)
+    stmt = upsert_insert(session, IndexFeatureSet, caller).values(
+        artifact_id=artifact_id, features=values
+    )
+    if session.get_bind().dialect.name == "postgresql":
+        merged = IndexFeatureSet.features.op("||")(stmt.excluded.features)
+    else:
+        merged = func.json_patch(IndexFeatureSet.features, stmt.excluded.features)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["artifact_id"],
+            set_={"features": merged, "updated_at": func.now()},
+        )
+    )
 
 # ---------------------------------------------------------------------------
 # Registration
@@ -49,7 +94,7 @@ def register_index_path(
     path: str,
     meta_data: dict[str, Any] | None = None,
     *,
-    sha256: str | None = None,
+    sha256: bytes | str | None = None,
     resolution_m: int = 10
 ) -> IndexArtifact:
     """
@@ -63,6 +108,11 @@ def register_index_path(
     Optional:
         meta_data  – arbitrary JSON-serializable dictionary
                      (CRS, resolution, processing options, etc.)
+
+    An already registered (scene_id, index_name, resolution_m) is returned
+    unchanged, before its path is interned or its file hashed. Otherwise
+    the row is written with INSERT ... ON CONFLICT DO NOTHING, so a
+    concurrent registration of the same key still resolves to one row.
     """
     if not scene_id:
         raise ValueError("register_index_path() requires non-empty scene_id.")
@@ -72,22 +122,109 @@ def register_index_path(
         raise ValueError("register_index_path() requires non-empty path.")
 
     session = get_session()
+    by_key = select(IndexArtifact).where(
+        IndexArtifact.scene_id == scene_id,
+        IndexArtifact.index_name == index_name,
+        IndexArtifact.resolution_m == resolution_m,
+    )
+    artifact = session.scalar(by_key)
+    if artifact is not None:
+        return artifact
+
+    stmt = (
+        upsert_insert(session, IndexArtifact, "register_index_path")
+        .values(
+            scene_id=scene_id,
+            index_name=index_name,
+            resolution_m=resolution_m,
+            path_id=get_or_create_path(session, path),
+            sha256=sha256 or hash_file_or_path(path),
+            meta_data=meta_data or {},
+        )
+        .on_conflict_do_nothing(index_elements=list(_ARTIFACT_KEY))
+        .returning(IndexArtifact)
+    )
+    # None only if a concurrent registration won the race.
+    artifact = session.scalar(stmt) or session.scalar(by_key)
+    commit_or_flush(session)
+    return artifact
+
 
-    artifact = IndexArtifact(
-        scene_id=scene_id,
-        index_name=index_name,
-        resolution_m=resolution_m,
-        path=path,
-        sha256=sha256 or _hash_file_or_path(path),
-        meta_data=meta_data or {},
-        created_at=_now(),
-        updated_at=_now(),
+def register_index_paths(items: list[dict[str, Any]]) -> list[IndexArtifact]:
+    """
+    Register many index artifacts at once.
+
+    Each item takes the same fields as register_index_path():
+        scene_id, index_name, path (required);
+        meta_data, sha256, resolution_m (optional).
+
+    Already registered (scene_id, index_name, resolution_m) keys are read
+    with one SELECT up front and returned unchanged; only the new items
+    get their paths interned and their missing hashes computed,
+    concurrently in a thread pool (hashlib releases the GIL while
+    digesting). They are then written with one multi-row
+    INSERT ... ON CONFLICT DO NOTHING ... RETURNING (the first item wins
+    for a key repeated in `items`).
+    """
+    if not items:
+        raise ValueError("register_index_paths() requires non-empty items.")
+    for item in items:
+        if not item.get("scene_id"):
+            raise ValueError("register_index_paths() requires non-empty scene_id.")
+        if not item.get("index_name"):
+            raise ValueError("register_index_paths() requires non-empty index_name.")
+        if not item.get("path"):
+            raise ValueError("register_index_paths() requires non-empty path.")
+
+    session = get_session()
+    keys = [(int(item["scene_id"]), item["index_name"], int(item.get("resolution_m", 10))) for item in items]
+    key_cols = tuple_(IndexArtifact.scene_id, IndexArtifact.index_name, IndexArtifact.resolution_m)
+    stmt = select(IndexArtifact).where(key_cols.in_(set(keys)))
+    by_key = {(a.scene_id, a.index_name, a.resolution_m): a for a in session.scalars(stmt)}
+
+    new_items: dict[tuple[int, str, int], dict[str, Any]] = {}
+    for key, item in zip(keys, items):
+        if key not in by_key:
+            new_items.setdefault(key, item)
+    if not new_items:
+        return [by_key[key] for key in keys]
+
+    to_hash = [item["path"] for item in new_items.values() if not item.get("sha256")]
+    hashes: Iterable[bytes] = []
+    if to_hash:
+        with ThreadPoolExecutor(max_workers=min(_HASH_WORKERS, len(to_hash))) as ex:
+            hashes = ex.map(hash_file_or_path, to_hash)
+    computed = iter(list(hashes))
+
+    path_ids = intern_paths(session, [item["path"] for item in new_items.values()])
+    rows = [
+        {
+            "scene_id": item["scene_id"],
+            "index_name": item["index_name"],
+            "resolution_m": item.get("resolution_m", 10),
+            "path_id": path_id,
+            "sha256": item.get("sha256") or next(computed),
+            "meta_data": item.get("meta_data") or {},
+        }
+        for item, path_id in zip(new_items.values(), path_ids, strict=True)
+    ]
+
+    stmt = (
+        upsert_insert(session, IndexArtifact, "register_index_paths")
+        .on_conflict_do_nothing(index_elements=list(_ARTIFACT_KEY))
+        .returning(IndexArtifact)
     )
+    for a in session.scalars(stmt, rows):
+        by_key[(a.scene_id, a.index_name, a.resolution_m)] = a
 
-    session.add(artifact)
-    session.commit()
-    session.refresh(artifact)
-    return artifact
+    # Keys a concurrent registration won in the meantime.
+    raced = {key for key in keys if key not in by_key}
+    if raced:
+        stmt = select(IndexArtifact).where(key_cols.in_(raced))
+        for a in session.scalars(stmt):
+            by_key[(a.scene_id, a.index_name, a.resolution_m)] = a
+    commit_or_flush(session)
+    return [by_key[key] for key in keys]
 
 
 def register_index_value(
@@ -106,17 +243,19 @@ def register_index_value(
 
     session = get_session()
 
-    feature = IndexFeature(
-        artifact_id=artifact_id,
-        key=key,
-        value=value,
-        units=units,
-        created_at=_now(),
+    stmt = (
+        insert(IndexFeature)
+        .values(
+            artifact_id=artifact_id,
+            key=key,
+            value=value,
+            units=units,
+        )
+        .returning(IndexFeature)
     )
-
-    session.add(feature)
-    session.commit()
-    session.refresh(feature)
+    feature = session.scalars(stmt).one()
+    _merge_feature_set(session, artifact_id, {key: float(value)}, "register_index_value")
+    commit_or_flush(session)
     return feature
 
 
@@ -135,26 +274,66 @@ def register_index_values(
         raise ValueError("register_index_values() requires non-empty values dict.")
 
     session = get_session()
-    features: list[IndexFeature] = []
+    rows = [
+        {
+            "artifact_id": artifact_id,
+            "key": key,
+            "value": float(val),
+            "units": units,
+        }
+        for key, val in values.items()
+    ]
+
+    # One multi-row INSERT; RETURNING populates IDs without per-row refreshes.
+    features = session.scalars(
+        insert(IndexFeature).returning(IndexFeature, sort_by_parameter_order=True),
+        rows,
+    ).all()
+    _merge_feature_set(
+        session, artifact_id, {row["key"]: row["value"] for row in rows}, "register_index_values"
+    )
+    commit_or_flush(session)
+    return features
 
-    for key, val in values.items():
-        feature = IndexFeature(
-            artifact_id=artifact_id,
-            key=key,
-            value=float(val),
-            units=units,
-            created_at=_now(),
-        )
-        session.add(feature)
-        features.append(feature)
 
-    session.commit()
+def copy_index_values(
+    artifact_id: int,
+    values: dict[str, float],
+    units: str | None = None,
+) -> int:
+    """
+    Bulk-load scalar features for a single artifact, without returning rows.
 
-    # refresh for IDs if needed
-    for f in features:
-        session.refresh(f)
+    Intended for very large value sets (thousands of keys). On PostgreSQL
+    with psycopg the rows are streamed with COPY ... FROM STDIN, which
+    skips per-row statement parsing and parameter binding; other backends
+    fall back to a multi-row INSERT. Use register_index_values() when the
+    created IndexFeature objects are needed.
 
-    return features
+    Returns:
+        number of features written.
+    """
+    if not values:
+        raise ValueError("copy_index_values() requires non-empty values dict.")
+
+    session = get_session()
+    rows = [(artifact_id, key, float(val), units) for key, val in values.items()]
+
+    conn = session.connection()
+    if conn.dialect.driver == "psycopg":
+        copy_sql = f"COPY {IndexFeature.__tablename__} ({', '.join(_COPY_COLUMNS)}) FROM STDIN"
+        with conn.connection.driver_connection.cursor() as cur:
+            with cur.copy(copy_sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+    else:
+        session.execute(insert(IndexFeature), [dict(zip(_COPY_COLUMNS, row)) for row in rows])
+
+    _merge_feature_set(
+        session, artifact_id, {key: val for _, key, val, _ in rows}, "copy_index_values"
+    )
+    commit_or_flush(session)
+    return len(rows)
 
 
 # ---------------------------------------------------------------------------
@@ -184,7 +363,7 @@ def update_index(
     changed = False
 
     if path is not None:
-        artifact.path = path
+        artifact.path_id = get_or_create_path(session, path)
         changed = True
 
     if metadata is not None:
@@ -192,8 +371,7 @@ def update_index(
         changed = True
 
     if changed:
-        artifact.updated_at = _now()
-        session.commit()
+        commit_or_flush(session)
     return changed
 
 
@@ -204,7 +382,7 @@ def update_indices(
     metadata: dict[str, Any] | None = None,
 ) -> int:
     """
-    Batch update artifacts.
+    Batch update artifacts with a single UPDATE statement.
 
     Returns:
         number of artifacts actually updated.
@@ -212,10 +390,22 @@ def update_indices(
     if not artifact_ids:
         raise ValueError("update_indices() requires non-empty artifact_ids.")
 
-    updated = 0
-    for artifact_id in artifact_ids:
-        if update_index(artifact_id, path=path, metadata=metadata):
-            updated += 1
+    session = get_session()
+    values: dict[str, Any] = {}
+    if path is not None:
+        values["path_id"] = get_or_create_path(session, path)
+    if metadata is not None:
+        values["meta_data"] = metadata
+    if not values:
+        return 0
+
+    stmt = (
+        update(IndexArtifact)
+        .where(IndexArtifact.id.in_(artifact_ids))
+        .values(**values)
+    )
+    updated = session.execute(stmt).rowcount
+    commit_or_flush(session)
     return updated
 
 
@@ -242,14 +432,9 @@ def get_indices(
     If no filters are provided, returns all artifacts (use with care).
     """
     session = get_session()
-    stmt = select(IndexArtifact)
-
-    if scene_id is not None:
-        stmt = stmt.where(IndexArtifact.scene_id == scene_id)
-    if index_name is not None:
-        stmt = stmt.where(IndexArtifact.index_name == index_name)
-
-    return list(session.scalars(stmt).all())
+    stmt = _GET_INDICES[(scene_id is not None, index_name is not None)]
+    params = {"scene_id": scene_id, "index_name": index_name}
+    return session.scalars(stmt, params).all()
 
 
 def get_index_value(feature_id: int) -> Optional[IndexFeature]:
@@ -268,24 +453,36 @@ def get_index_values(
     Get all features for a given artifact, optionally filtered by keys.
     """
     session = get_session()
-    stmt = select(IndexFeature).where(IndexFeature.artifact_id == artifact_id)
-
     if keys:
-        stmt = stmt.where(IndexFeature.key.in_(keys))
+        params = {"artifact_id": artifact_id, "keys": list(keys)}
+        return session.scalars(_GET_INDEX_VALUES_BY_KEYS, params).all()
+    return session.scalars(_GET_INDEX_VALUES, {"artifact_id": artifact_id}).all()
 
-    return list(session.scalars(stmt).all())
+
+def get_index_features(artifact_id: int, keys: list[str] | None = None) -> dict[str, float]:
+    """
+    Get all features for a given artifact as {key: value}, optionally
+    filtered by keys.
+
+    Reads the single IndexFeatureSet row instead of one IndexFeature row
+    per key; units are not part of the set (use get_index_values()).
+    """
+    session = get_session()
+    features = session.scalar(_GET_INDEX_FEATURES, {"artifact_id": artifact_id}) or {}
+    if keys:
+        return {key: features[key] for key in keys if key in features}
+    return dict(features)
 
 
 def list_indices_one(scene_id: int) -> list[IndexArtifact]:
     """
-    List all artifacts for a single scene.
+    List all artifacts for a single scene, with their features preloaded.
     """
     if not scene_id:
         raise ValueError("list_indices_one() requires non-empty scene_id.")
 
     session = get_session()
-    stmt = select(IndexArtifact).where(IndexArtifact.scene_id == scene_id)
-    return list(session.scalars(stmt).all())
+    return session.scalars(_LIST_INDICES_ONE, {"scene_id": scene_id}).all()
 
 
 def list_indices_all() -> list[IndexArtifact]:
@@ -294,7 +491,39 @@ def list_indices_all() -> list[IndexArtifact]:
     """
     session = get_session()
     stmt = select(IndexArtifact)
-    return list(session.scalars(stmt).all())
+    return session.scalars(stmt).all()
+
+
+def backfill_index_feature_sets() -> int:
+    """
+    Build IndexFeatureSet rows from existing IndexFeature rows.
+
+    One INSERT ... SELECT groups the features per artifact
+    (jsonb_object_agg / json_group_object) and replaces any existing set,
+    so it is safe to re-run. Needed once for artifacts registered before
+    feature sets existed.
+
+    Returns:
+        number of feature sets written.
+    """
+    session = get_session()
+    if session.get_bind().dialect.name == "postgresql":
+        grouped = func.jsonb_object_agg(IndexFeature.key, IndexFeature.value)
+    else:
+        grouped = func.json_group_object(IndexFeature.key, IndexFeature.value)
+
+    # WHERE true: SQLite needs it to parse INSERT ... SELECT ... ON CONFLICT.
+    source = select(IndexFeature.artifact_id, grouped).where(true()).group_by(IndexFeature.artifact_id)
+    stmt = upsert_insert(session, IndexFeatureSet, "backfill_index_feature_sets").from_select(
+        ["artifact_id", "features"], source
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["artifact_id"],
+        set_={"features": stmt.excluded.features, "updated_at": func.now()},
+    )
+    written = session.execute(stmt).rowcount
+    commit_or_flush(session)
+    return written
 
 
 # ---------------------------------------------------------------------------
@@ -309,18 +538,15 @@ def delete_index(artifact_id: int) -> bool:
         True if artifact existed and was deleted, False otherwise.
     """
     session = get_session()
-    artifact = session.get(IndexArtifact, artifact_id)
-    if artifact is None:
-        return False
-
-    session.delete(artifact)
-    session.commit()
-    return True
+    stmt = delete(IndexArtifact).where(IndexArtifact.id == artifact_id).returning(IndexArtifact.id)
+    deleted = session.execute(stmt).first() is not None
+    commit_or_flush(session)
+    return deleted
 
 
 def delete_indices(*artifact_ids: int) -> int:
     """
-    Delete multiple artifacts by ID.
+    Delete multiple artifacts by ID with a single DELETE statement.
 
     Returns:
         number of artifacts actually deleted.
@@ -328,8 +554,8 @@ def delete_indices(*artifact_ids: int) -> int:
     if not artifact_ids:
         raise ValueError("delete_indices() requires at least one artifact_id.")
 
-    deleted = 0
-    for artifact_id in artifact_ids:
-        if delete_index(artifact_id):
-            deleted += 1
+    session = get_session()
+    stmt = delete(IndexArtifact).where(IndexArtifact.id.in_(artifact_ids))
+    deleted = session.execute(stmt).rowcount
+    commit_or_flush(session)
     return deleted
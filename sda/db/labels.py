@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+"""
+Small label dimension tables (index names, change methods).
+"""
+
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from sda.db.session import lookup_cache_get, lookup_cache_put, upsert_insert
+
+
+def get_or_create_label(session: Session, model: Any, name: str) -> int:
+    """
+    Return the id of the `model` row (IndexName / ChangeMethod) named `name`,
+    creating it if needed.
+
+    Written with INSERT ... ON CONFLICT DO NOTHING and read back with one
+    SELECT. Ids are kept in the session lookup cache for the rest of the
+    transaction (a rollback drops them with the rows they name).
+    """
+    if not name:
+        raise ValueError("get_or_create_label(): name is required.")
+
+    key = (model.__tablename__, name)
+    label_id = lookup_cache_get(session, key)
+    if label_id is not None:
+        return label_id
+
+    stmt = upsert_insert(session, model, "get_or_create_label")
+    session.execute(stmt.values(name=name).on_conflict_do_nothing(index_elements=["name"]))
+    label_id = session.scalar(select(model.id).where(model.name == name))
+    lookup_cache_put(session, key, label_id)
+    return label_id
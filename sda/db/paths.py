@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+"""
+Interned file paths for artifact tables (scene assets, index artifacts, changes).
+"""
+
+from typing import Iterable
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from sda.db.session import lookup_cache_get, lookup_cache_put, upsert_insert
+from sda.models.path import PathDir, PathEntry
+
+
+def _split(full_path: str) -> tuple[str, str]:
+    """
+    Split a path into (directory prefix incl. separator, file name).
+
+    dir + name always rebuilds the input exactly.
+    """
+    cut = max(full_path.rfind("/"), full_path.rfind("\\")) + 1
+    return full_path[:cut], full_path[cut:]
+
+
+def intern_paths(session: Session, paths: Iterable[str]) -> list[int]:
+    """
+    Return PathEntry ids for `paths`, creating missing directories and
+    entries.
+
+    Directories and entries are each written with one multi-row
+    INSERT ... ON CONFLICT DO NOTHING and read back with one SELECT.
+    Directory ids are kept in the session lookup cache for the rest of
+    the transaction, so files in an already-seen directory skip the
+    directory round-trips; a rollback drops them with the rows they name.
+
+    Returns:
+        ids in the order of `paths`.
+    """
+    pairs = [_split(p) for p in paths]
+    if not pairs:
+        return []
+
+    dir_ids: dict[str, int] = {}
+    missing: list[str] = []
+    for dir_path in dict.fromkeys(d for d, _ in pairs):
+        cached = lookup_cache_get(session, ("path_dir", dir_path))
+        if cached is None:
+            missing.append(dir_path)
+        else:
+            dir_ids[dir_path] = cached
+
+    if missing:
+        stmt = upsert_insert(session, PathDir, "intern_paths")
+        session.execute(
+            stmt.on_conflict_do_nothing(index_elements=["path"]),
+            [{"path": d} for d in missing],
+        )
+        stmt = select(PathDir.path, PathDir.id).where(PathDir.path.in_(missing))
+        for dir_path, dir_id in session.execute(stmt):
+            dir_ids[dir_path] = dir_id
+            lookup_cache_put(session, ("path_dir", dir_path), dir_id)
+
+    keys = list(dict.fromkeys((dir_ids[d], name) for d, name in pairs))
+    stmt = upsert_insert(session, PathEntry, "intern_paths")
+    session.execute(
+        stmt.on_conflict_do_nothing(index_elements=["dir_id", "name"]),
+        [{"dir_id": dir_id, "name": name} for dir_id, name in keys],
+    )
+    stmt = select(PathEntry.dir_id, PathEntry.name, PathEntry.id).where(
+        tuple_(PathEntry.dir_id, PathEntry.name).in_(keys)
+    )
+    entry_ids = {(dir_id, name): entry_id for dir_id, name, entry_id in session.execute(stmt)}
+    return [entry_ids[(dir_ids[d], name)] for d, name in pairs]
+
+
+def get_or_create_path(session: Session, full_path: str) -> int:
+    """
+    Return the PathEntry id for a single path, creating it if needed.
+    """
+    if not full_path:
+        raise ValueError("get_or_create_path(): full_path is required.")
+    return intern_paths(session, [full_path])[0]
@@ -6,15 +6,21 @@ Role and permission checks (placeholder API).
 
 from typing import Any
 
+# Permission storage is not wired up yet. While disabled, the placeholders
+# return None instead of raising, so callers in hot paths stay cheap.
+_RBAC_ENABLED: bool = False
+
 def check_perm(user_id: str | None = None, params: dict[str, Any] | None = None):
     """
     Validate whether a user has permission for a given action.
 
-    This repository does not implement permission storage yet, so the
-    function raises NotImplementedError as a clear signal to callers.
+    This repository does not implement permission storage yet: returns
+    None while RBAC is disabled and raises NotImplementedError otherwise.
     """
     if user_id is None and params is None:
         raise ValueError("check_perm(): user_id or params must be provided.")
+    if not _RBAC_ENABLED:
+        return None
     raise NotImplementedError("check_perm() is not implemented yet.")
 
 
@@ -22,10 +28,13 @@ def grant_perm(user_id: str | None = None, params: dict[str, Any] | None = None)
     """
     Grant permissions to a user or role.
 
-    This is a placeholder hook for future RBAC integration.
+    This is a placeholder hook for future RBAC integration;
+    returns None while RBAC is disabled.
     """
     if user_id is None and params is None:
         raise ValueError("grant_perm(): user_id or params must be provided.")
+    if not _RBAC_ENABLED:
+        return None
     raise NotImplementedError("grant_perm() is not implemented yet.")
 
 
@@ -33,10 +42,13 @@ def revoke_perm(user_id: str | None = None, params: dict[str, Any] | None = None
     """
     Revoke permissions from a user or role.
 
-    This is a placeholder hook for future RBAC integration.
+    This is a placeholder hook for future RBAC integration;
+    returns None while RBAC is disabled.
     """
     if user_id is None and params is None:
         raise ValueError("revoke_perm(): user_id or params must be provided.")
+    if not _RBAC_ENABLED:
+        return None
     raise NotImplementedError("revoke_perm() is not implemented yet.")
 
 
@@ -44,8 +56,11 @@ def list_perms(role: str | None = None):
     """
     List permissions granted to a role.
 
-    This is a placeholder hook for future RBAC integration.
+    This is a placeholder hook for future RBAC integration;
+    returns None while RBAC is disabled.
     """
     if role is None:
         raise ValueError("list_perms(): role must be provided.")
+    if not _RBAC_ENABLED:
+        return None
     raise NotImplementedError("list_perms() is not implemented yet.")
@@ -4,17 +4,20 @@ from __future__ import annotations
 AOI (Areas of Interest), analysis regions.
 """
 
-from typing import Any, Optional, List, Tuple
+from typing import Any, Iterator, Optional, List, Tuple
 
 from sqlalchemy import select
 
 from sda.auth.config import DEFAULT_STR
-from sda.db.session import get_session
+from sda.db.session import commit_or_flush, get_session, lookup_cache_get, lookup_cache_pop, lookup_cache_put
 from sda.models.region import Region
 
 
 # Constants
 
+# Batch size for streaming iter_* helpers.
+_YIELD_PER = 1000
+
 # Deprecated or too massive for the model, don't use
 INTERNATIONAL_STR   = "INTERNATIONAL"
 INTERNATIONAL_COORD = (-180.0, -90.0, 180.0, 90.0)
@@ -80,8 +83,8 @@ def register_region(
     )
 
     session.add(region)
-    session.commit()
-    session.refresh(region)
+    commit_or_flush(session)
+    lookup_cache_pop(session, ("region_by_name", name))
     return region
 
 
@@ -112,13 +115,19 @@ def get_regions_by_ids(*region_ids: int) -> list[Region]:
 def get_region_by_name(name: str) -> Optional[Region]:
     """
     Get a region by its name.
+
+    Hits are cached on the session (see lookup_cache_get()).
     """
     if not name:
         raise ValueError("get_region_by_name() requires non-empty name.")
 
     session = get_session()
-    stmt = select(Region).where(Region.name == name)
-    return session.scalar(stmt)
+    key = ("region_by_name", name)
+    region = lookup_cache_get(session, key)
+    if region is None:
+        region = session.scalar(select(Region).where(Region.name == name))
+        lookup_cache_put(session, key, region)
+    return region
 
 
 def get_regions_by_names(*names: str) -> list[Region]:
@@ -137,13 +146,20 @@ def get_regions_by_names(*names: str) -> list[Region]:
 # List
 # ---------------------------------------------------------------------------
 
+def iter_regions() -> Iterator[Region]:
+    """
+    Stream all registered regions in batches of _YIELD_PER.
+    """
+    session = get_session()
+    stmt = select(Region).execution_options(yield_per=_YIELD_PER)
+    yield from session.scalars(stmt)
+
+
 def list_regions() -> list[Region]:
     """
     List all registered regions.
     """
-    session = get_session()
-    stmt = select(Region)
-    return list(session.scalars(stmt).all())
+    return list(iter_regions())
 
 
 # ---------------------------------------------------------------------------
@@ -171,6 +187,7 @@ def update_region(
         return False
 
     changed = False
+    old_name = region.name
 
     if name is not None:
         if not name:
@@ -197,9 +214,8 @@ def update_region(
         changed = True
 
     if changed:
-        # If Region has an updated_at, set it here; if not, this line can be removed
-        # region.updated_at = datetime.utcnow()
-        session.commit()
+        commit_or_flush(session)
+        lookup_cache_pop(session, ("region_by_name", old_name), ("region_by_name", region.name))
 
     return changed
 
@@ -221,6 +237,7 @@ def delete_region(region_id: int) -> bool:
         return False
 
     session.delete(region)
-    session.commit()
+    commit_or_flush(session)
+    lookup_cache_pop(session, ("region_by_name", region.name))
     return True
 
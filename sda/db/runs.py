@@ -6,21 +6,40 @@ Pipeline — series of connected processes where the output
 of one stage is the input for the next.
 """
 
-from datetime import datetime
-from typing import Optional, Iterable
+from typing import Iterator, Optional, Iterable
 
-from sqlalchemy import select
+from sqlalchemy import Row, Select, delete, func, select, update
 
-from sda.db.session import get_session
-from sda.models.run import Run
+from sda.db.session import commit_or_flush, get_session
+from sda.models.run import Run, RunStatus
+
+
+# UPDATE ... RETURNING Run refreshes an already-loaded Run in place, so
+# callers holding the object see the new values without another SELECT.
+_REFRESH = {"populate_existing": True}
+
+# Batch size for streaming iter_* helpers.
+_YIELD_PER = 1000
+
+# Numeric status codes accepted by list_runs_one(): code -> Run.status.
+_STATUS_BY_CODE: tuple[RunStatus, ...] = tuple(RunStatus)
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _now() -> datetime:
-    return datetime.utcnow()
+def _where_status(stmt: Select, status: str | int | None) -> Select:
+    """
+    Add a Run.status filter for a status name or numeric code.
+    """
+    if isinstance(status, str):
+        stmt = stmt.where(Run.status == status)
+    elif isinstance(status, int):
+        if not 0 <= status < len(_STATUS_BY_CODE):
+            raise ValueError(f"Unknown numeric status: {status}")
+        stmt = stmt.where(Run.status == _STATUS_BY_CODE[status])
+    return stmt
 
 
 # ---------------------------------------------------------------------------
@@ -48,13 +67,11 @@ def create_run(
         user_id=user_id,
         profile=profile,
         params=params or {},
-        status="pending",
-        started_at=_now(),
+        status=RunStatus.PENDING,
     )
 
     session.add(run)
-    session.commit()
-    session.refresh(run)
+    commit_or_flush(session)
     return run
 
 
@@ -78,51 +95,63 @@ def list_runs_one(user_id: str, status: str | int | None = None) -> list[Run]:
         raise ValueError("list_runs_one() requires non-empty user_id.")
 
     session = get_session()
-    stmt = select(Run).where(Run.user_id == user_id)
+    stmt = _where_status(select(Run).where(Run.user_id == user_id), status)
+    return list(session.scalars(stmt).all())
 
-    if isinstance(status, str):
-        stmt = stmt.where(Run.status == status)
-    elif isinstance(status, int):
-        # Example mapping; you can change this to your own convention
-        mapping = {
-            0: "pending",
-            1: "running",
-            2: "finished",
-            3: "failed",
-            4: "killed",
-        }
-        status_str = mapping.get(status)
-        if status_str is None:
-            raise ValueError(f"Unknown numeric status: {status}")
-        stmt = stmt.where(Run.status == status_str)
 
-    return list(session.scalars(stmt).all())
+def list_run_summaries(user_id: str, status: str | int | None = None) -> list[Row]:
+    """
+    List lightweight run rows for a single user (for table/list views).
+
+    Same filters as list_runs_one(), but only selects id, profile, status,
+    started_at and finished_at as plain rows; `params` JSON and `error`
+    text are not loaded and no Run objects are built.
+    """
+    if not user_id:
+        raise ValueError("list_run_summaries() requires non-empty user_id.")
+
+    session = get_session()
+    stmt = select(
+        Run.id,
+        Run.profile,
+        Run.status,
+        Run.started_at,
+        Run.finished_at,
+    ).where(Run.user_id == user_id)
+    return list(session.execute(_where_status(stmt, status)).all())
+
+
+def iter_runs_all() -> Iterator[Run]:
+    """
+    Stream all runs (for all users) in batches of _YIELD_PER.
+    """
+    session = get_session()
+    stmt = select(Run).execution_options(yield_per=_YIELD_PER)
+    yield from session.scalars(stmt)
 
 
 def list_runs_all() -> list[Run]:
     """
     List all runs (for all users).
     """
-    session = get_session()
-    stmt = select(Run)
-    return list(session.scalars(stmt).all())
+    return list(iter_runs_all())
 
 
-def update_run_status(run_id: int, status: str = "kill") -> bool:
+def update_run_status(run_id: int, status: RunStatus | str = RunStatus.KILLED) -> bool:
     """
     Update status of a run.
 
+    `status` must be a RunStatus value; unknown strings raise before any
+    SQL is sent.
+
     Returns:
         True if the run exists and was updated, False otherwise.
     """
     session = get_session()
-    run = session.get(Run, run_id)
-    if run is None:
-        return False
-
-    run.status = status
-    session.commit()
-    return True
+    stmt = update(Run).where(Run.id == run_id).values(status=status).returning(Run)
+    run = session.scalar(stmt, execution_options=_REFRESH)
+    commit_or_flush(session)
+    return run is not None
 
 
 def finish_run(
@@ -141,19 +170,19 @@ def finish_run(
     Returns:
         True if run found and updated, False otherwise.
     """
-    session = get_session()
-    run = session.get(Run, run_id)
-    if run is None:
-        return False
-
-    run.success = success
-    run.finished_at = _now()
-    run.status = "finished" if success else "failed"
+    values: dict[str, object] = {
+        "success": success,
+        "finished_at": func.now(),
+        "status": RunStatus.FINISHED if success else RunStatus.FAILED,
+    }
     if error is not None:
-        run.error = error
+        values["error"] = error
 
-    session.commit()
-    return True
+    session = get_session()
+    stmt = update(Run).where(Run.id == run_id).values(**values).returning(Run)
+    run = session.scalar(stmt, execution_options=_REFRESH)
+    commit_or_flush(session)
+    return run is not None
 
 
 def delete_run(run_id: int) -> bool:
@@ -169,13 +198,13 @@ def delete_run(run_id: int) -> bool:
         return False
 
     session.delete(run)
-    session.commit()
+    commit_or_flush(session)
     return True
 
 
 def delete_runs(*run_ids: int) -> int:
     """
-    Delete multiple runs by ID.
+    Delete multiple runs by ID with a single DELETE statement.
 
     Returns:
         number of runs actually deleted.
@@ -183,11 +212,10 @@ def delete_runs(*run_ids: int) -> int:
     if not run_ids:
         raise ValueError("delete_runs() requires at least one run_id.")
 
-    deleted = 0
-    for run_id in run_ids:
-        if delete_run(run_id):
-            deleted += 1
-    return deleted
+    session = get_session()
+    result = session.execute(delete(Run).where(Run.id.in_(run_ids)))
+    commit_or_flush(session)
+    return result.rowcount
 
 
 def delete_run_all() -> int:
@@ -195,14 +223,9 @@ def delete_run_all() -> int:
     Delete all runs.
 
     Returns:
-        number of rows deleted (best-effort approximation).
+        number of rows deleted.
     """
     session = get_session()
-    runs = session.scalars(select(Run)).all()
-    count = len(runs)
-
-    for run in runs:
-        session.delete(run)
-    session.commit()
-
-    return count
+    result = session.execute(delete(Run))
+    commit_or_flush(session)
+    return result.rowcount
@@ -8,15 +8,210 @@ All functions are intentionally thin and explicit to keep behavior predictable
 and auditable for contributors.
 """
 
+import operator
+from dataclasses import dataclass, fields
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Iterator, Optional
+
+import numpy as np
+from sqlalchemy import (
+    DateTime,
+    Enum,
+    Row,
+    String,
+    and_,
+    bindparam,
+    cast,
+    delete,
+    exists,
+    func,
+    insert,
+    or_,
+    select,
+    tuple_,
+)
+from sqlalchemy.orm import selectinload
+
+from sda.db.session import (
+    commit_or_flush,
+    get_session,
+    list_load_options,
+    lookup_cache_get,
+    lookup_cache_pop,
+    lookup_cache_put,
+    upsert_insert,
+)
+from sda.models.change import Change
+from sda.models.index_artifact import IndexArtifact
+from sda.models.scene import ProcessingLevel, Satellite, Scene
+from sda.models.scene_asset import SceneAsset
+from sda.db.assets import register_asset, register_assets, list_assets_one, get_asset
+from sda.utils.quadkey import QUADKEY_ZOOM, bbox2ancestors, bbox2ranges, bbox_range, fit_zoom
+
+# Batch size for streaming iter_* helpers.
+_YIELD_PER = 1000
+
+# list_scenes_in_tiles() lowers the zoom until the bbox is covered by at
+# most this many tiles, which bounds the number of range predicates.
+_MAX_QUERY_TILES = 256
+
+# Scene columns holding the six affine coefficients, in Affine(a..f) order.
+_AFFINE_COLUMNS: tuple[str, ...] = ("aff_a", "aff_b", "aff_c", "aff_d", "aff_e", "aff_f")
+
+
+def _optional_filter(
+    column: Any,
+    name: str,
+    type_: Any,
+    op: Callable[[Any, Any], Any] = operator.eq,
+) -> Any:
+    """
+    `op(column, :name)` that is ignored when the parameter is NULL.
+
+    Enum parameters are wrapped in an explicit CAST: psycopg sends them
+    untyped, and the `IS NULL` side gives PostgreSQL nothing to infer from.
+    """
+    param = bindparam(name, type_=type_)
+    if isinstance(type_, Enum):
+        param = cast(param, type_)
+    return or_(param.is_(None), op(column, param))
+
+
+# list_scenes_filtered() filter key -> bind parameter name.
+_SCENE_FILTER_PARAMS = {
+    "tile": "tile",
+    "satellite": "satellite",
+    "product_id": "product_id",
+    "from": "acquired_from",
+    "to": "acquired_to",
+}
+
+# Every filter is always present and disabled by binding NULL, so the SQL
+# text (and its compiled-cache entry / server plan) is the same for every
+# combination of filters.
+_LIST_SCENES_FILTERED = (
+    select(Scene)
+    .where(
+        _optional_filter(Scene.tile, "tile", String),
+        # Bound with the column type: PostgreSQL has no `enum = varchar` operator.
+        _optional_filter(Scene.satellite, "satellite", Scene.satellite.type),
+        _optional_filter(Scene.product_id, "product_id", String),
+        _optional_filter(Scene.acquisition_time, "acquired_from", DateTime, operator.ge),
+        _optional_filter(Scene.acquisition_time, "acquired_to", DateTime, operator.le),
+    )
+)
+
+# load_scene_full(): one SELECT per relationship level, whatever the fan-out.
+_LOAD_SCENE_FULL = (
+    select(Scene)
+    .where(Scene.id == bindparam("scene_id"))
+    .options(
+        selectinload(Scene.assets),
+        selectinload(Scene.artifacts).selectinload(IndexArtifact.features),
+        selectinload(Scene.artifacts).selectinload(IndexArtifact.feature_set),
+        selectinload(Scene.changes_before).selectinload(Change.scene_after),
+        selectinload(Scene.changes_after).selectinload(Change.scene_before),
+    )
+)
+
+
+def _bbox_overlaps(
+    dialect: str,
+    geom_tuple: tuple[float, float, float, float],
+) -> Any:
+    """
+    WHERE clause: Scene bbox intersects (lon_min, lat_min, lon_max, lat_max).
+
+    On PostgreSQL this is `box && box` over the same expression as
+    ix_scene_bbox_spgist, so the planner probes the SP-GiST index.
+    Elsewhere it falls back to four range predicates.
+    """
+    lon_min, lat_min, lon_max, lat_max = map(float, geom_tuple)
+    if dialect == "postgresql":
+        scene_box = func.box(
+            func.point(Scene.lon_min, Scene.lat_min),
+            func.point(Scene.lon_max, Scene.lat_max),
+        )
+        query_box = func.box(func.point(lon_min, lat_min), func.point(lon_max, lat_max))
+        return scene_box.op("&&")(query_box)
+    return and_(
+        Scene.lon_min <= lon_max,
+        Scene.lon_max >= lon_min,
+        Scene.lat_min <= lat_max,
+        Scene.lat_max >= lat_min,
+    )
 
-from sqlalchemy import select
 
-from sda.db.session import get_session
-from sda.models.scene import Scene
-from sda.models.scene_asset import SceneAsset
-from sda.db.assets import register_asset, list_assets_one, get_asset, delete_asset
+# ---------------------------------------------------------------------------
+# Input validation
+# ---------------------------------------------------------------------------
+
+@dataclass(slots=True, frozen=True)
+class SceneInput:
+    """
+    Validated fields for one Scene row (see create_scene() for meanings).
+
+    Checks run once in __post_init__; ingestion can build these up front
+    and hand them to create_scenes_bulk() or register_or_get_scene().
+    """
+    product_id: str
+    satellite: str
+    tile: str
+    acquisition_time: datetime
+    crs: str
+    transform: list[float]
+    width: int
+    height: int
+    lon_min: float
+    lat_min: float
+    lon_max: float
+    lat_max: float
+    processing_level: str = "L2A"
+    source_zip: str = ""
+
+    def __post_init__(self) -> None:
+        if not self.product_id:
+            raise ValueError("SceneInput(): product_id is required.")
+        try:
+            Satellite(self.satellite)
+        except ValueError:
+            raise ValueError(f"SceneInput(): unknown satellite {self.satellite!r}.") from None
+        if not self.tile:
+            raise ValueError("SceneInput(): tile is required.")
+        if self.acquisition_time is None:
+            raise ValueError("SceneInput(): acquisition_time is required.")
+        if not self.crs:
+            raise ValueError("SceneInput(): crs is required.")
+        if not self.transform or len(self.transform) != 9:
+            raise ValueError("SceneInput(): transform must have length 9.")
+        if self.width <= 0 or self.height <= 0:
+            raise ValueError("SceneInput(): width and height must be positive.")
+        if not (-180 <= self.lon_min <= self.lon_max <= 180 and -90 <= self.lat_min <= self.lat_max <= 90):
+            raise ValueError("SceneInput(): bbox must be ordered min <= max within WGS84 bounds.")
+        try:
+            ProcessingLevel(self.processing_level)
+        except ValueError:
+            raise ValueError(
+                f"SceneInput(): unknown processing_level {self.processing_level!r}."
+            ) from None
+
+    def as_row(self) -> dict[str, Any]:
+        """
+        Column values for insert(Scene) / Scene(**row).
+        """
+        row = {name: getattr(self, name) for name in _SCENE_INPUT_FIELDS}
+        row.update(zip(_AFFINE_COLUMNS, row.pop("transform")[:6]))
+        row["quadkey_lo"], row["quadkey_hi"] = bbox_range(
+            self.lon_min, self.lat_min, self.lon_max, self.lat_max
+        )
+        return row
+
+
+_SCENE_INPUT_FIELDS: tuple[str, ...] = tuple(f.name for f in fields(SceneInput))
+
+
+def _scene_input(row: SceneInput | dict[str, Any]) -> SceneInput:
+    return row if isinstance(row, SceneInput) else SceneInput(**row)
 
 
 def create_scene(
@@ -55,23 +250,7 @@ def create_scene(
         processing_level – processing level label (default "L2A").
         source_zip       – source archive path (optional).
     """
-    if not product_id:
-        raise ValueError("create_scene(): product_id is required.")
-    if not satellite:
-        raise ValueError("create_scene(): satellite is required.")
-    if not tile:
-        raise ValueError("create_scene(): tile is required.")
-    if acquisition_time is None:
-        raise ValueError("create_scene(): acquisition_time is required.")
-    if not crs:
-        raise ValueError("create_scene(): crs is required.")
-    if not transform or len(transform) != 9:
-        raise ValueError("create_scene(): transform must have length 9.")
-    if width <= 0 or height <= 0:
-        raise ValueError("create_scene(): width and height must be positive.")
-
-    session = get_session()
-    scene = Scene(
+    scene_input = SceneInput(
         product_id=product_id,
         satellite=satellite,
         tile=tile,
@@ -86,11 +265,60 @@ def create_scene(
         lat_max=lat_max,
         processing_level=processing_level,
         source_zip=source_zip,
-        created_at=datetime.utcnow(),
     )
+
+    session = get_session()
+    scene = Scene(**scene_input.as_row())
     session.add(scene)
-    session.commit()
-    session.refresh(scene)
+    commit_or_flush(session)
+    return scene
+
+
+def create_scenes_bulk(rows: list[SceneInput | dict[str, Any]]) -> list[Scene]:
+    """
+    Create many Scene rows with one multi-row INSERT and a single commit.
+
+    Each row is a SceneInput, or a dict of its fields (the create_scene()
+    arguments) which is validated through SceneInput.
+
+    Returns:
+        created Scene instances, in the order of `rows`.
+    """
+    if not rows:
+        return []
+
+    params = [_scene_input(row).as_row() for row in rows]
+
+    session = get_session()
+    scenes = session.scalars(
+        insert(Scene).returning(Scene, sort_by_parameter_order=True),
+        params,
+    ).all()
+    commit_or_flush(session)
+    return list(scenes)
+
+
+def register_or_get_scene(row: SceneInput | dict[str, Any]) -> Scene:
+    """
+    Return the Scene for row["product_id"], creating it if it does not exist.
+
+    `row` is a SceneInput or a dict of its fields, as for create_scenes_bulk().
+    Uses one INSERT ... ON CONFLICT (product_id) DO UPDATE ... RETURNING,
+    which is race-free and replaces the scene_exists_product() +
+    create_scene() pair. An existing row is returned unchanged (the
+    conflict update only rewrites product_id with itself).
+    """
+    params = _scene_input(row).as_row()
+
+    session = get_session()
+    stmt = upsert_insert(session, Scene, "register_or_get_scene").values(**params)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Scene.product_id],
+        set_={"product_id": stmt.excluded.product_id},
+    ).returning(Scene)
+    scene = session.scalars(stmt, execution_options={"populate_existing": True}).one()
+    commit_or_flush(session)
+    lookup_cache_put(session, ("scene_by_product_id", scene.product_id), scene)
     return scene
 
 
@@ -102,7 +330,7 @@ def create_scene_asset(
     path: str,
     *,
     is_resampled: bool = False,
-    sha256: str | None = None,
+    sha256: bytes | str | None = None,
 ) -> SceneAsset:
     """
     Create and persist a SceneAsset row using the assets helper.
@@ -118,6 +346,13 @@ def create_scene_asset(
     )
 
 
+def create_scene_assets_bulk(rows: list[dict[str, Any]]) -> list[SceneAsset]:
+    """
+    Create many SceneAsset rows in one INSERT using the assets helper.
+    """
+    return register_assets(rows)
+
+
 def list_scene_assets(scene_id: int) -> list[SceneAsset]:
     """
     List all assets for a scene by internal scene id.
@@ -128,21 +363,57 @@ def list_scene_assets(scene_id: int) -> list[SceneAsset]:
 def list_scene_assets_by_product_id(product_id: str) -> list[SceneAsset]:
     """
     List all assets for a scene by Sentinel product_id.
+
+    Scene and assets are fetched together via selectinload(Scene.assets).
     """
-    scene = get_scene_by_product_id(product_id)
+    if not product_id:
+        raise ValueError("list_scene_assets_by_product_id(): product_id required")
+
+    session = get_session()
+    stmt = (
+        select(Scene)
+        .options(selectinload(Scene.assets))
+        .where(Scene.product_id == product_id)
+    )
+    scene = session.scalar(stmt)
     if scene is None:
         return []
-    return list_assets_one(scene.id)
+    return list(scene.assets)
 
 
 def get_scene_with_assets(scene_id: int) -> tuple[Scene | None, list[SceneAsset]]:
     """
     Return a scene and its assets in one call.
+
+    Scene and assets are fetched together via selectinload(Scene.assets).
     """
-    scene = get_scene_by_pk(scene_id)
+    if scene_id <= 0:
+        raise ValueError("get_scene_with_assets(): scene_id must be positive")
+
+    session = get_session()
+    stmt = select(Scene).options(selectinload(Scene.assets)).where(Scene.id == scene_id)
+    scene = session.scalar(stmt)
     if scene is None:
         return None, []
-    return scene, list_assets_one(scene_id)
+    return scene, list(scene.assets)
+
+
+def load_scene_full(scene_id: int) -> Optional[Scene]:
+    """
+    Return a scene with its whole derived-artifact tree loaded, or None.
+
+    Loads assets, index artifacts with their features and feature set,
+    and changes in both directions with the other scene of each pair.
+    Each relationship is one selectinload query, however many rows it
+    fans out to, so walking the tree never issues per-row lazy loads. With SDA_RAISELOAD
+    enabled, anything outside this tree raises on access.
+    """
+    if scene_id <= 0:
+        raise ValueError("load_scene_full(): scene_id must be positive")
+
+    session = get_session()
+    stmt = _LOAD_SCENE_FULL.options(*list_load_options())
+    return session.scalar(stmt, {"scene_id": scene_id})
 
 
 def get_scene_asset(scene_id: int, kind: str) -> Optional[SceneAsset]:
@@ -156,13 +427,27 @@ def delete_scene_with_assets(scene_id: int) -> bool:
     """
     Delete a scene and all attached assets.
 
+    The scene is deleted first; assets are only touched (and the
+    transaction only committed) when it existed, so a miss leaves nothing
+    pending on the session.
+
     Returns:
         True if the scene existed and was deleted, False otherwise.
     """
-    assets = list_assets_one(scene_id)
-    for asset in assets:
-        delete_asset(asset.id)
-    return delete_scene_by_pk(scene_id)
+    if scene_id <= 0:
+        raise ValueError("delete_scene_with_assets(): scene_id must be positive")
+
+    session = get_session()
+    stmt = delete(Scene).where(Scene.id == scene_id).returning(Scene.product_id)
+    product_id = session.scalar(stmt)
+    if product_id is None:
+        return False
+
+    # ON DELETE CASCADE covers this where foreign keys are enforced.
+    session.execute(delete(SceneAsset).where(SceneAsset.scene_id == scene_id))
+    commit_or_flush(session)
+    lookup_cache_pop(session, ("scene_by_product_id", product_id))
+    return True
 
 # ---------------------------------------------------------------------------
 # Get (single)
@@ -186,6 +471,8 @@ def get_scene_by_product_id(product_id: str) -> Optional[Scene]:
     """
     Get a scene by Sentinel product ID.
 
+    Hits are cached on the session (see lookup_cache_get()).
+
     Example:
         S2C_MSIL2A_20260106T072311_N0511_R006_T41VNE_20260106T103817
     """
@@ -193,8 +480,12 @@ def get_scene_by_product_id(product_id: str) -> Optional[Scene]:
         raise ValueError("get_scene_by_product_id(): product_id required")
 
     session = get_session()
-    stmt = select(Scene).where(Scene.product_id == product_id)
-    return session.scalar(stmt)
+    key = ("scene_by_product_id", product_id)
+    scene = lookup_cache_get(session, key)
+    if scene is None:
+        scene = session.scalar(select(Scene).where(Scene.product_id == product_id))
+        lookup_cache_put(session, key, scene)
+    return scene
 
 
 def get_scene_by_tiledate(tile: str, acquisition_time: datetime) -> Optional[Scene]:
@@ -223,6 +514,37 @@ def get_scene_by_tiledate(tile: str, acquisition_time: datetime) -> Optional[Sce
 # List
 # ---------------------------------------------------------------------------
 
+def iter_scenes_all() -> Iterator[Scene]:
+    """
+    Stream all scenes in the database in batches of _YIELD_PER.
+
+    Prefer this over list_scenes_all() for exports and admin scans;
+    memory stays bounded by the batch size.
+    """
+    session = get_session()
+    stmt = select(Scene).execution_options(yield_per=_YIELD_PER)
+    yield from session.scalars(stmt)
+
+
+def iter_scene_summaries() -> Iterator[Row]:
+    """
+    Stream lightweight scene rows for exports and list views.
+
+    Yields plain rows of (id, product_id, satellite, tile,
+    acquisition_time) in batches of _YIELD_PER. No Scene objects are
+    built and nothing is added to the session's identity map.
+    """
+    session = get_session()
+    stmt = select(
+        Scene.id,
+        Scene.product_id,
+        Scene.satellite,
+        Scene.tile,
+        Scene.acquisition_time,
+    ).execution_options(yield_per=_YIELD_PER)
+    yield from session.execute(stmt)
+
+
 def list_scenes_all() -> list[Scene]:
     """
     List all scenes in the database.
@@ -230,9 +552,7 @@ def list_scenes_all() -> list[Scene]:
     WARNING:
         Unbounded query. Use only for admin, diagnostics, or tests.
     """
-    session = get_session()
-    stmt = select(Scene)
-    return list(session.scalars(stmt).all())
+    return list(iter_scenes_all())
 
 
 def list_scenes_filtered(params: dict[str, str]) -> list[Scene]:
@@ -248,26 +568,92 @@ def list_scenes_filtered(params: dict[str, str]) -> list[Scene]:
 
     Any unsupported key raises ValueError.
     """
-    session = get_session()
-    stmt = select(Scene)
-
+    bound: dict[str, Any] = dict.fromkeys(_SCENE_FILTER_PARAMS.values())
     for key, value in params.items():
-        if key == "tile":
-            stmt = stmt.where(Scene.tile == value)
-        elif key == "satellite":
-            stmt = stmt.where(Scene.satellite == value)
-        elif key == "product_id":
-            stmt = stmt.where(Scene.product_id == value)
-        elif key == "from":
-            stmt = stmt.where(Scene.acquisition_time >= datetime.fromisoformat(value))
-        elif key == "to":
-            stmt = stmt.where(Scene.acquisition_time <= datetime.fromisoformat(value))
-        else:
+        name = _SCENE_FILTER_PARAMS.get(key)
+        if name is None:
             raise ValueError(f"list_scenes_filtered(): unsupported filter key '{key}'")
+        if key in ("from", "to"):
+            value = datetime.fromisoformat(value)
+        bound[name] = value
+
+    session = get_session()
+    return list(session.scalars(_LIST_SCENES_FILTERED, bound).all())
+
+
+def list_scenes_in_bbox(geom_tuple: tuple[float, float, float, float]) -> list[Scene]:
+    """
+    List scenes whose bounding box intersects the given one.
+
+    Args:
+        geom_tuple – bounding box (lon_min, lat_min, lon_max, lat_max),
+                     e.g. the bbox of a registered Region.
+    """
+    if len(geom_tuple) != 4:
+        raise ValueError("list_scenes_in_bbox(): geom_tuple must be (lon_min, lat_min, lon_max, lat_max).")
 
+    session = get_session()
+    dialect = session.get_bind().dialect.name
+    stmt = select(Scene).where(_bbox_overlaps(dialect, geom_tuple))
     return list(session.scalars(stmt).all())
 
 
+def list_scenes_in_tiles(
+    geom_tuple: tuple[float, float, float, float],
+    zoom: int,
+) -> list[Scene]:
+    """
+    List scenes touching the Web-Mercator tiles at `zoom` that cover a bbox.
+
+    Matches on the precomputed quadkey range: scenes inside a covering tile
+    are found with one BETWEEN per merged tile range (bbox2ranges()), and
+    larger scenes by their exact ancestor range (bbox2ancestors()). Both
+    probe the quadkey_lo B-tree. The test is tile-granular, so a scene
+    may be returned whose bbox only shares a covering tile with the query.
+
+    Args:
+        geom_tuple – bounding box (lon_min, lat_min, lon_max, lat_max).
+        zoom       – tile zoom level (0..QUADKEY_ZOOM); higher is tighter
+                     but yields more ranges. Lowered automatically until
+                     at most _MAX_QUERY_TILES tiles cover the bbox.
+    """
+    if len(geom_tuple) != 4:
+        raise ValueError("list_scenes_in_tiles(): geom_tuple must be (lon_min, lat_min, lon_max, lat_max).")
+    if not 0 <= zoom <= QUADKEY_ZOOM:
+        raise ValueError(f"list_scenes_in_tiles(): zoom must be in 0..{QUADKEY_ZOOM}.")
+    lon_min, lat_min, lon_max, lat_max = map(float, geom_tuple)
+    if lon_min > lon_max or lat_min > lat_max:
+        raise ValueError("list_scenes_in_tiles(): bbox min must not exceed max.")
+
+    zoom = fit_zoom(lon_min, lat_min, lon_max, lat_max, zoom, _MAX_QUERY_TILES)
+    ranges = bbox2ranges(lon_min, lat_min, lon_max, lat_max, zoom)
+    clauses = [Scene.quadkey_lo.between(lo, hi) for lo, hi in ranges]
+    ancestors = bbox2ancestors(lon_min, lat_min, lon_max, lat_max, zoom)
+    if ancestors:
+        clauses.append(tuple_(Scene.quadkey_lo, Scene.quadkey_hi).in_(ancestors))
+
+    session = get_session()
+    return list(session.scalars(select(Scene).where(or_(*clauses))).all())
+
+
+def get_scene_transforms(scene_ids: list[int]) -> np.ndarray:
+    """
+    Affine coefficients for many scenes as one (N, 6) float64 array.
+
+    Row i holds (a, b, c, d, e, f) for scene_ids[i], ready for vectorized
+    pixel -> world transforms. Only the six coefficient columns are
+    selected; no Scene objects are built. Unknown ids raise KeyError.
+    """
+    if not scene_ids:
+        return np.empty((0, 6), dtype=np.float64)
+
+    session = get_session()
+    cols = [getattr(Scene, name) for name in _AFFINE_COLUMNS]
+    stmt = select(Scene.id, *cols).where(Scene.id.in_(scene_ids))
+    by_id = {row[0]: row[1:] for row in session.execute(stmt)}
+    return np.array([by_id[scene_id] for scene_id in scene_ids], dtype=np.float64)
+
+
 # ---------------------------------------------------------------------------
 # Exists
 # ---------------------------------------------------------------------------
@@ -275,10 +661,14 @@ def list_scenes_filtered(params: dict[str, str]) -> list[Scene]:
 def scene_exists_pk(scene_pk: int) -> bool:
     """
     Check whether a scene exists by internal primary key.
+
+    Uses SELECT EXISTS(...) so no Scene row is loaded.
     """
     if scene_pk <= 0:
         return False
-    return get_scene_by_pk(scene_pk) is not None
+
+    session = get_session()
+    return bool(session.scalar(select(exists().where(Scene.id == scene_pk))))
 
 
 def scene_exists_product(product_id: str) -> bool:
@@ -287,7 +677,9 @@ def scene_exists_product(product_id: str) -> bool:
     """
     if not product_id:
         return False
-    return get_scene_by_product_id(product_id) is not None
+
+    session = get_session()
+    return bool(session.scalar(select(exists().where(Scene.product_id == product_id))))
 
 
 # ---------------------------------------------------------------------------
@@ -311,7 +703,8 @@ def delete_scene_by_pk(scene_pk: int) -> bool:
         return False
 
     session.delete(scene)
-    session.commit()
+    commit_or_flush(session)
+    lookup_cache_pop(session, ("scene_by_product_id", scene.product_id))
     return True
 
 
@@ -333,5 +726,6 @@ def delete_scene_by_product(product_id: str) -> bool:
         return False
 
     session.delete(scene)
-    session.commit()
+    commit_or_flush(session)
+    lookup_cache_pop(session, ("scene_by_product_id", product_id))
     return True
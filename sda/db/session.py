@@ -4,18 +4,48 @@ from __future__ import annotations
 Managing sessions and transactions.
 """
 
-from contextlib import contextmanager
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
 from contextvars import ContextVar
-from typing import Generator, Optional
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Generator, Hashable, Optional
 
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, raiseload, sessionmaker
 
-from sda.db.engine import get_engine
+from sda.db.engine import get_async_engine, get_engine, raiseload_enabled
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
 # Factory for creating Session objects (lazy-initialized).
 _SessionFactory: Optional[sessionmaker[Session]] = None
 
+# Factory for AsyncSession objects (lazy-initialized, see async_session_scope()).
+_AsyncSessionFactory: Optional["async_sessionmaker[AsyncSession]"] = None
+
+# Sessions auto-created by get_session(), so close_all_sessions() can
+# return their connections at worker/request shutdown. Weak references:
+# a session dropped by its context is not kept alive here.
+_OPEN_SESSIONS: "weakref.WeakSet[Session]" = weakref.WeakSet()
+
+# Per-session lookup cache (see lookup_cache_get()), stored in Session.info
+# and dropped when the transaction commits or rolls back (see the listeners
+# after lookup_cache_clear()).
+_LOOKUP_CACHE_KEY = "sda_lookup_cache"
+_LOOKUP_CACHE_SIZE = 256
+
+# Session.info flag set by session_scope(); see commit_or_flush().
+_SCOPED_KEY = "sda_scoped"
+
+# Dialect-specific INSERT constructs that support ON CONFLICT (see upsert_insert()).
+_UPSERT_INSERT = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 # Context-local "current" session (per async task / thread / greenlet).
 _CURRENT_SESSION: ContextVar[Optional[Session]] = ContextVar(
     "_CURRENT_SESSION",
@@ -26,11 +56,14 @@ _CURRENT_SESSION: ContextVar[Optional[Session]] = ContextVar(
 def _get_session_factory() -> sessionmaker[Session]:
     """
     Return the global Session factory, creating it on first use.
+
+    The factory is rebuilt if init_engine() has replaced the engine it
+    was bound to.
     """
     global _SessionFactory
 
-    if _SessionFactory is None:
-        engine = get_engine()
+    engine = get_engine()
+    if _SessionFactory is None or _SessionFactory.kw.get("bind") is not engine:
         _SessionFactory = sessionmaker(
             bind=engine,
             autoflush=False,
@@ -48,15 +81,167 @@ def get_session() -> Session:
 
     This allows zero-argument helpers like commit_session() and
     rollback_session() to operate on the context-local session.
+
+    A read through such a session keeps its pooled connection checked out
+    until the session commits, rolls back or closes. Long-lived workers
+    should call close_session() per task, or close_all_sessions() on
+    shutdown.
     """
     session = _CURRENT_SESSION.get()
     if session is None:
         factory = _get_session_factory()
         session = factory()
+        _OPEN_SESSIONS.add(session)
         _CURRENT_SESSION.set(session)
     return session
 
 
+def use_session(session: Optional[Session] = None) -> Session:
+    """
+    Return `session` if given, otherwise the context-local session.
+
+    Lets CRUD helpers accept an explicit session so batch callers can share
+    one session (and one pooled connection) across several calls.
+    """
+    if session is not None:
+        return session
+    return get_session()
+
+
+def commit_or_flush(session: Session) -> None:
+    """
+    Commit `session`, unless it belongs to an enclosing session_scope().
+
+    Inside a scope the CRUD helpers only flush (so generated keys and
+    constraint errors still surface immediately) and the scope commits
+    once on exit. A pipeline step that registers a scene and a dozen
+    assets then pays for one commit instead of thirteen.
+    """
+    if session.info.get(_SCOPED_KEY):
+        session.flush()
+    else:
+        session.commit()
+
+
+def upsert_insert(session: Session, model: Any, caller: str) -> Any:
+    """
+    INSERT for `model` with .on_conflict_do_nothing()/.on_conflict_do_update()
+    for the session's dialect.
+
+    Raises ValueError naming `caller` on dialects without ON CONFLICT.
+    """
+    dialect = session.get_bind().dialect.name
+    make_insert = _UPSERT_INSERT.get(dialect)
+    if make_insert is None:
+        raise ValueError(f"{caller}(): unsupported dialect '{dialect}'")
+    return make_insert(model)
+
+
+def list_load_options(*options: Any) -> tuple[Any, ...]:
+    """
+    Loader options for list helpers: `options` (e.g. selectinload(...)),
+    plus raiseload("*") when SDA_RAISELOAD is enabled.
+
+    In development this turns any relationship a caller did not eager-load
+    into an error instead of a silent per-row (N+1) query.
+    """
+    if raiseload_enabled():
+        return (*options, raiseload("*"))
+    return options
+
+
+# ---------------------------------------------------------------------------
+# Lookup cache
+# ---------------------------------------------------------------------------
+
+def _lookup_cache(session: Session) -> OrderedDict[Hashable, Any]:
+    cache = session.info.get(_LOOKUP_CACHE_KEY)
+    if cache is None:
+        cache = session.info[_LOOKUP_CACHE_KEY] = OrderedDict()
+    return cache
+
+
+def lookup_cache_get(session: Session, key: Hashable) -> Any:
+    """
+    Return the cached value for `key` on this session, or None.
+
+    Used by hot by-name lookups (regions, scenes, users) so repeated calls
+    in one transaction cost no query. The cache is dropped on commit and
+    rollback, so rows changed by other processes are seen by the next
+    transaction and ids of rolled-back inserts are never reused.
+    Only hits are cached; writers must call lookup_cache_pop() for the
+    keys they change.
+    """
+    cache = _lookup_cache(session)
+    value = cache.get(key)
+    if value is not None:
+        cache.move_to_end(key)
+    return value
+
+
+def lookup_cache_put(session: Session, key: Hashable, value: Any) -> None:
+    """
+    Store `value` under `key`, evicting the least recently used entry
+    beyond _LOOKUP_CACHE_SIZE.
+    """
+    if value is None:
+        return
+    cache = _lookup_cache(session)
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _LOOKUP_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def lookup_cache_pop(session: Session, *keys: Hashable) -> None:
+    """
+    Drop `keys` from the session's lookup cache (missing keys are ignored).
+    """
+    cache = _lookup_cache(session)
+    for key in keys:
+        cache.pop(key, None)
+
+
+def lookup_cache_clear(session: Session) -> None:
+    """
+    Drop every cached lookup for the session (e.g. after a rollback).
+    """
+    session.info.pop(_LOOKUP_CACHE_KEY, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _clear_lookup_cache_on_commit(session: Session) -> None:
+    """
+    Drop the lookup cache once the transaction commits.
+
+    get_session() sessions live as long as their context; without this a
+    row cached in one transaction would outlive changes (or deletes) made
+    by other processes.
+    """
+    lookup_cache_clear(session)
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_lookup_cache_on_rollback(session: Session) -> None:
+    """
+    Drop the lookup cache when the transaction rolls back.
+
+    Ids cached for rows inserted in the rolled-back transaction (labels,
+    path dirs) no longer exist; reusing them would violate FKs or point
+    at another row.
+    """
+    lookup_cache_clear(session)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_lookup_cache_on_soft_rollback(session: Session, previous_transaction: Any) -> None:
+    """
+    Same as _clear_lookup_cache_on_rollback(), for rollbacks that do not
+    reach the database (savepoints, already-failed transactions).
+    """
+    lookup_cache_clear(session)
+
+
 @contextmanager
 def session_scope() -> Generator[Session, None, None]:
     """
@@ -68,6 +253,9 @@ def session_scope() -> Generator[Session, None, None]:
             session.add(obj)
             session.flush()
 
+    CRUD helpers called inside the scope flush instead of committing
+    (see commit_or_flush()), so the whole block is one transaction.
+
     On successful exit:
         - commits the transaction
 
@@ -77,9 +265,11 @@ def session_scope() -> Generator[Session, None, None]:
 
     In all cases:
         - closes the session and clears the context-local binding
+        - drops the session's lookup cache (see lookup_cache_get())
     """
     factory = _get_session_factory()
     session = factory()
+    session.info[_SCOPED_KEY] = True
 
     # Bind this session to the current context.
     token = _CURRENT_SESSION.set(session)
@@ -93,6 +283,7 @@ def session_scope() -> Generator[Session, None, None]:
     finally:
         try:
             session.close()
+            lookup_cache_clear(session)
         finally:
             # Restore previous context value (if any).
             _CURRENT_SESSION.reset(token)
@@ -132,5 +323,80 @@ def close_session() -> None:
 
     try:
         session.close()
+        lookup_cache_clear(session)
     finally:
         _CURRENT_SESSION.set(None)
+
+
+def close_all_sessions() -> int:
+    """
+    Close every session auto-created by get_session(), in any context.
+
+    Meant for worker or process shutdown (and tests), where contexts of
+    finished threads/tasks may still hold sessions with checked-out
+    connections. A closed session stays usable: if its context touches it
+    again, it simply checks out a new connection.
+
+    Returns:
+        number of sessions closed.
+    """
+    sessions = list(_OPEN_SESSIONS)
+    for session in sessions:
+        session.close()
+        lookup_cache_clear(session)
+    return len(sessions)
+
+
+# ---------------------------------------------------------------------------
+# Async sessions
+# ---------------------------------------------------------------------------
+
+def _get_async_session_factory() -> "async_sessionmaker[AsyncSession]":
+    """
+    Return the global AsyncSession factory, creating it on first use.
+
+    Mirrors _get_session_factory(): rebuilt when init_async_engine() has
+    replaced the engine, and expire_on_commit=False so returned rows stay
+    usable without an implicit (awaitable) refresh.
+    """
+    global _AsyncSessionFactory
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    engine = get_async_engine()
+    if _AsyncSessionFactory is None or _AsyncSessionFactory.kw.get("bind") is not engine:
+        _AsyncSessionFactory = async_sessionmaker(
+            bind=engine,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+
+    return _AsyncSessionFactory
+
+
+@asynccontextmanager
+async def async_session_scope() -> AsyncGenerator["AsyncSession", None]:
+    """
+    Async counterpart of session_scope().
+
+    Usage:
+        async with async_session_scope() as session:
+            rows = (await session.scalars(select(Scene))).all()
+            # or reuse a sync CRUD helper on the same connection:
+            key = await session.run_sync(lambda s: get_api_key(raw, session=s))
+
+    Commits on success, rolls back and re-raises on exception, and always
+    closes the session. The async session is not bound to the context-local
+    slot used by get_session(); pass it explicitly.
+    """
+    factory = _get_async_session_factory()
+    session = factory()
+
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    finally:
+        await session.close()
@@ -4,19 +4,14 @@ from __future__ import annotations
 Aggregation statistics (areas, clusters, metrics).
 """
 
-from datetime import datetime
 from typing import Any, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
 
-from sda.db.session import get_session
+from sda.db.session import commit_or_flush, get_session
 from sda.models.stats import Stats
 
 
-def _now() -> datetime:
-    return datetime.utcnow()
-
-
 def register_stats(run_id: int, stats_: dict[str, Any]) -> Stats:
     """
     Create aggregation statistics for a run.
@@ -36,16 +31,10 @@ def register_stats(run_id: int, stats_: dict[str, Any]) -> Stats:
     if existing is not None:
         raise ValueError(f"Stats for run_id={run_id} already exist. Use update_stats().")
 
-    stats = Stats(
-        run_id=run_id,
-        stats=stats_,
-        created_at=_now(),
-        updated_at=_now(),
-    )
+    stats = Stats(run_id=run_id, stats=stats_)
 
     session.add(stats)
-    session.commit()
-    session.refresh(stats)
+    commit_or_flush(session)
     return stats
 
 
@@ -75,14 +64,13 @@ def update_stats(run_id: int, stats_: dict[str, Any]) -> bool:
         raise ValueError("update_stats() requires non-empty stats_ dict.")
 
     session = get_session()
-    stats = session.get(Stats, run_id)
-    if stats is None:
-        return False
-
-    stats.stats = stats_
-    stats.updated_at = _now()
-    session.commit()
-    return True
+    result = session.execute(
+        update(Stats)
+        .where(Stats.run_id == run_id)
+        .values(stats=stats_)
+    )
+    commit_or_flush(session)
+    return result.rowcount > 0
 
 
 def delete_stats(run_id: int) -> bool:
@@ -96,11 +84,7 @@ def delete_stats(run_id: int) -> bool:
         raise ValueError("delete_stats() requires run_id.")
 
     session = get_session()
-    stats = session.get(Stats, run_id)
-    if stats is None:
-        return False
-
-    session.delete(stats)
-    session.commit()
-    return True
+    result = session.execute(delete(Stats).where(Stats.run_id == run_id))
+    commit_or_flush(session)
+    return result.rowcount > 0
 
@@ -1,17 +1,36 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
 import requests
-from sqlalchemy import select
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.orm import load_only
 
-from sda.db.session import get_session
+from sda.db.session import commit_or_flush, get_session, list_load_options
 from sda.io.cdse_consts import CDSE_CLIENT_URL
+from sda.io.download_fast import shared_session
 from sda.io.get_token import get_cdse_token_payload
 from sda.models.cdse_token import CDSEToken
 
 
+# _token_is_valid() results per access token: token -> (monotonic ts, ok).
+_PING_TTL_S = 60.0
+_ping_cache: dict[str, tuple[float, bool]] = {}
+
+# get_or_create_valid_token() skips the ping for tokens valid longer than this.
+_PING_MARGIN = timedelta(minutes=5)
+
+# Columns an expiry/validity check needs; skips password and refresh_token.
+_BRIEF_COLUMNS = load_only(
+    CDSEToken.id,
+    CDSEToken.is_revoked,
+    CDSEToken.expires_at,
+    CDSEToken.access_token,
+)
+
+
 def _now() -> datetime:
     return datetime.utcnow()
 
@@ -22,19 +41,57 @@ def _compute_expires_at(issued_at: datetime, expires_in_s: int | None) -> dateti
     return issued_at + timedelta(seconds=int(expires_in_s))
 
 
+def _token_row(login: str, password: str, payload: dict, issued_at: datetime) -> dict:
+    """
+    CDSEToken column values for a token endpoint payload.
+    """
+    expires_in_s = payload.get("expires_in")
+    return {
+        "login": login,
+        "password": password,
+        "access_token": payload.get("access_token", ""),
+        "refresh_token": payload.get("refresh_token"),
+        "token_type": payload.get("token_type"),
+        "scope": payload.get("scope"),
+        "expires_in_s": expires_in_s,
+        "issued_at": issued_at,
+        "expires_at": _compute_expires_at(issued_at, expires_in_s),
+        "is_revoked": False,
+    }
+
+
 def _token_is_valid(access_token: str, timeout: int = 20) -> bool:
     """
     Check token validity by pinging the CDSE STAC endpoint.
 
+    Results are cached for _PING_TTL_S seconds per token, so repeated
+    calls within one run cost a single HTTP round-trip.
+
     Returns:
         True if the token is accepted, False if unauthorized or request fails.
     """
+    now = time.monotonic()
+    cached = _ping_cache.get(access_token)
+    if cached is not None and now - cached[0] < _PING_TTL_S:
+        return cached[1]
+
     headers = {"Authorization": f"Bearer {access_token}"}
     try:
-        response = requests.get(CDSE_CLIENT_URL, headers=headers, timeout=timeout)
+        # Pooled keep-alive session; stream=True so only the status line and
+        # headers are read, the catalog body is never downloaded.
+        with shared_session().get(
+            CDSE_CLIENT_URL, headers=headers, timeout=timeout, stream=True
+        ) as response:
+            ok = response.status_code < 400
     except requests.RequestException:
+        # Network failures are not cached; the next call retries.
         return False
-    return response.status_code < 400
+
+    # Drop stale entries so rotated tokens do not accumulate.
+    for key in [k for k, (ts, _) in _ping_cache.items() if now - ts >= _PING_TTL_S]:
+        del _ping_cache[key]
+    _ping_cache[access_token] = (now, ok)
+    return ok
 
 
 def create_token(login: str, password: str, totp: str | None = None) -> CDSEToken:
@@ -47,33 +104,46 @@ def create_token(login: str, password: str, totp: str | None = None) -> CDSEToke
         raise ValueError("create_token(): password is required.")
 
     payload = get_cdse_token_payload(login, password, totp=totp)
-
-    issued_at = _now()
-    expires_in_s = payload.get("expires_in")
-    expires_at = _compute_expires_at(issued_at, expires_in_s)
-
-    token = CDSEToken(
-        login=login,
-        password=password,
-        access_token=payload.get("access_token", ""),
-        refresh_token=payload.get("refresh_token"),
-        token_type=payload.get("token_type"),
-        scope=payload.get("scope"),
-        expires_in_s=expires_in_s,
-        issued_at=issued_at,
-        expires_at=expires_at,
-        is_revoked=False,
-        created_at=issued_at,
-        updated_at=issued_at,
-    )
+    token = CDSEToken(**_token_row(login, password, payload, _now()))
 
     session = get_session()
     session.add(token)
-    session.commit()
-    session.refresh(token)
+    commit_or_flush(session)
     return token
 
 
+def create_tokens_bulk(items: list[tuple[str, str, dict]]) -> list[CDSEToken]:
+    """
+    Persist many already-fetched CDSE token payloads in one INSERT.
+
+    Args:
+        items – (login, password, payload) tuples, where payload is the
+                token endpoint response (see get_cdse_token_payload()).
+
+    Returns:
+        created CDSEToken rows, in the order of `items`.
+    """
+    if not items:
+        return []
+
+    issued_at = _now()
+    rows = []
+    for login, password, payload in items:
+        if not login:
+            raise ValueError("create_tokens_bulk(): login is required.")
+        if not password:
+            raise ValueError("create_tokens_bulk(): password is required.")
+        rows.append(_token_row(login, password, payload, issued_at))
+
+    session = get_session()
+    tokens = session.scalars(
+        insert(CDSEToken).returning(CDSEToken, sort_by_parameter_order=True),
+        rows,
+    ).all()
+    commit_or_flush(session)
+    return list(tokens)
+
+
 def get_token_by_id(token_id: int) -> Optional[CDSEToken]:
     """
     Return a token row by primary key.
@@ -87,15 +157,20 @@ def list_tokens(login: str | None = None) -> list[CDSEToken]:
     List tokens, optionally filtered by login.
     """
     session = get_session()
-    stmt = select(CDSEToken)
+    stmt = select(CDSEToken).options(*list_load_options())
     if login:
         stmt = stmt.where(CDSEToken.login == login)
     return list(session.scalars(stmt).all())
 
 
-def get_latest_token(login: str) -> Optional[CDSEToken]:
+def get_latest_token(login: str, *, brief: bool = False) -> Optional[CDSEToken]:
     """
     Return the most recently issued token for a login.
+
+    Args:
+        login – CDSE login.
+        brief – load only id, is_revoked, expires_at and access_token; the
+                remaining columns are fetched lazily on first access.
     """
     if not login:
         raise ValueError("get_latest_token(): login is required.")
@@ -105,7 +180,37 @@ def get_latest_token(login: str) -> Optional[CDSEToken]:
         select(CDSEToken)
         .where(CDSEToken.login == login)
         .order_by(CDSEToken.issued_at.desc())
+        .limit(1)
+    )
+    if brief:
+        stmt = stmt.options(_BRIEF_COLUMNS)
+    return session.scalar(stmt)
+
+
+def get_latest_valid_token(login: str, *, brief: bool = False) -> Optional[CDSEToken]:
+    """
+    Return the most recently issued token for a login that is neither
+    revoked nor expired, or None.
+
+    The revocation/expiry checks run in SQL, so no stale row is loaded.
+    `brief` works as in get_latest_token().
+    """
+    if not login:
+        raise ValueError("get_latest_valid_token(): login is required.")
+
+    session = get_session()
+    stmt = (
+        select(CDSEToken)
+        .where(
+            CDSEToken.login == login,
+            CDSEToken.is_revoked.is_(False),
+            or_(CDSEToken.expires_at.is_(None), CDSEToken.expires_at > _now()),
+        )
+        .order_by(CDSEToken.issued_at.desc())
+        .limit(1)
     )
+    if brief:
+        stmt = stmt.options(_BRIEF_COLUMNS)
     return session.scalar(stmt)
 
 
@@ -131,17 +236,21 @@ def get_or_create_valid_token(
     Return a valid token for a login, creating one if required.
 
     Validation order:
-        1) If the latest token is expired or revoked, create a new token.
-        2) If ping validation is enabled and the token is rejected, create a new token.
+        1) If there is no unexpired, unrevoked token, create a new token.
+        2) If ping validation is enabled, the token expires within _PING_MARGIN
+           (or has no expiry) and the ping rejects it, create a new token.
     """
-    token = get_latest_token(login)
+    token = get_latest_valid_token(login, brief=True)
     if token is None:
         return create_token(login, password, totp=totp)
 
-    if token_is_expired(token):
-        return create_token(login, password, totp=totp)
-
-    if validate_with_ping and not _token_is_valid(token.access_token):
+    # Only ping when the token is close to (or has no known) expiry; a token
+    # the server issued with plenty of lifetime left is trusted as is.
+    if (
+        validate_with_ping
+        and (token.expires_at is None or token.expires_at - _now() < _PING_MARGIN)
+        and not _token_is_valid(token.access_token)
+    ):
         return create_token(login, password, totp=totp)
 
     return token
@@ -152,13 +261,13 @@ def revoke_token(token_id: int) -> bool:
     Mark a token as revoked.
     """
     session = get_session()
-    token = session.get(CDSEToken, token_id)
-    if token is None:
-        return False
-    token.is_revoked = True
-    token.updated_at = _now()
-    session.commit()
-    return True
+    result = session.execute(
+        update(CDSEToken)
+        .where(CDSEToken.id == token_id)
+        .values(is_revoked=True)
+    )
+    commit_or_flush(session)
+    return result.rowcount > 0
 
 
 def revoke_tokens_for_login(login: str) -> int:
@@ -169,13 +278,14 @@ def revoke_tokens_for_login(login: str) -> int:
         raise ValueError("revoke_tokens_for_login(): login is required.")
 
     session = get_session()
-    stmt = select(CDSEToken).where(CDSEToken.login == login)
-    tokens = list(session.scalars(stmt).all())
-    for token in tokens:
-        token.is_revoked = True
-        token.updated_at = _now()
-    session.commit()
-    return len(tokens)
+    stmt = (
+        update(CDSEToken)
+        .where(CDSEToken.login == login)
+        .values(is_revoked=True)
+    )
+    result = session.execute(stmt)
+    commit_or_flush(session)
+    return result.rowcount
 
 
 def delete_token(token_id: int) -> bool:
@@ -183,12 +293,9 @@ def delete_token(token_id: int) -> bool:
     Delete a token row by primary key.
     """
     session = get_session()
-    token = session.get(CDSEToken, token_id)
-    if token is None:
-        return False
-    session.delete(token)
-    session.commit()
-    return True
+    result = session.execute(delete(CDSEToken).where(CDSEToken.id == token_id))
+    commit_or_flush(session)
+    return result.rowcount > 0
 
 
 def delete_tokens_for_login(login: str) -> int:
@@ -199,26 +306,24 @@ def delete_tokens_for_login(login: str) -> int:
         raise ValueError("delete_tokens_for_login(): login is required.")
 
     session = get_session()
-    stmt = select(CDSEToken).where(CDSEToken.login == login)
-    tokens = list(session.scalars(stmt).all())
-    for token in tokens:
-        session.delete(token)
-    session.commit()
-    return len(tokens)
+    result = session.execute(delete(CDSEToken).where(CDSEToken.login == login))
+    commit_or_flush(session)
+    return result.rowcount
 
 
 def purge_expired_tokens() -> int:
     """
     Delete tokens that are expired or explicitly revoked.
+
+    Issues a single DELETE; no rows are loaded.
     """
     session = get_session()
-    stmt = select(CDSEToken)
-    tokens = list(session.scalars(stmt).all())
-    to_delete = [
-        token for token in tokens
-        if token.is_revoked or (token.expires_at is not None and _now() >= token.expires_at)
-    ]
-    for token in to_delete:
-        session.delete(token)
-    session.commit()
-    return len(to_delete)
+    stmt = delete(CDSEToken).where(
+        or_(
+            CDSEToken.is_revoked.is_(True),
+            and_(CDSEToken.expires_at.is_not(None), CDSEToken.expires_at <= _now()),
+        )
+    )
+    result = session.execute(stmt)
+    commit_or_flush(session)
+    return result.rowcount
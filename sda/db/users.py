@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import hmac
 from typing import Optional, Iterable
 
-from sqlalchemy import select
-from sda.db.session import get_session
+from sqlalchemy import delete, exists, insert, select, update
+from sda.db.session import (
+    commit_or_flush,
+    get_session,
+    list_load_options,
+    lookup_cache_get,
+    lookup_cache_pop,
+    lookup_cache_put,
+)
 from sda.auth.config import DEFAULT_STR
 from sda.models.user import User
 
@@ -22,15 +31,69 @@ def create_user(
         role=role,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    commit_or_flush(session)
     return user
 
 
+def create_users_bulk(rows: list[dict[str, str]]) -> list[User]:
+    """
+    Create many users with one multi-row INSERT and a single commit.
+
+    Each row needs `login` and `pass_hash`; `token` and `role` default
+    like in create_user().
+    """
+    if not rows:
+        return []
+
+    params = []
+    for row in rows:
+        if not row.get("login") or not row.get("pass_hash"):
+            raise ValueError("create_users_bulk() requires login and pass_hash in every row.")
+        params.append({"token": DEFAULT_STR, "role": DEFAULT_STR, **row})
+
+    session = get_session()
+    users = session.scalars(
+        insert(User).returning(User, sort_by_parameter_order=True),
+        params,
+    ).all()
+    commit_or_flush(session)
+    return list(users)
+
+
 def get_user_by_login(login: str) -> Optional[User]:
+    """
+    Get a user by login.
+
+    Hits are cached for the current transaction (see lookup_cache_get()).
+    Password and role updates made through this module also refresh the
+    cached object in place; changes from other processes are picked up by
+    the next transaction, since commit drops the cache.
+    """
     session = get_session()
-    stmt = select(User).where(User.login == login)
-    return session.scalar(stmt)
+    key = ("user_by_login", login)
+    user = lookup_cache_get(session, key)
+    if user is None:
+        user = session.scalar(select(User).where(User.login == login))
+        lookup_cache_put(session, key, user)
+    return user
+
+
+def get_user_by_token(token: str) -> Optional[User]:
+    """
+    Get a user by API token.
+
+    Hits are cached on the session, as in get_user_by_login().
+    """
+    if not token:
+        raise ValueError("get_user_by_token() requires non-empty token.")
+
+    session = get_session()
+    key = ("user_by_token", token)
+    user = lookup_cache_get(session, key)
+    if user is None:
+        user = session.scalar(select(User).where(User.token == token).limit(1))
+        lookup_cache_put(session, key, user)
+    return user
 
 
 def get_user_by_id(user_id: int) -> Optional[User]:
@@ -40,7 +103,7 @@ def get_user_by_id(user_id: int) -> Optional[User]:
 
 def list_users() -> Iterable[User]:
     session = get_session()
-    stmt = select(User)
+    stmt = select(User).options(*list_load_options())
     return session.scalars(stmt).all()
 
 
@@ -50,13 +113,11 @@ def update_user_pass(user_id: int, pass_hash: str) -> bool:
     Returns True, if user found and saved.
     """
     session = get_session()
-    user = session.get(User, user_id)
-    if user is None:
-        return False
-
-    user.pass_hash = pass_hash
-    session.commit()
-    return True
+    result = session.execute(
+        update(User).where(User.id == user_id).values(pass_hash=pass_hash)
+    )
+    commit_or_flush(session)
+    return result.rowcount > 0
 
 
 def update_user_role(user_id: int, role: str) -> bool:
@@ -65,13 +126,11 @@ def update_user_role(user_id: int, role: str) -> bool:
     Returns True, if user found and saved.
     """
     session = get_session()
-    user = session.get(User, user_id)
-    if user is None:
-        return False
-
-    user.role = role
-    session.commit()
-    return True
+    result = session.execute(
+        update(User).where(User.id == user_id).values(role=role)
+    )
+    commit_or_flush(session)
+    return result.rowcount > 0
 
 
 def delete_user(user_id: int) -> bool:
@@ -80,29 +139,54 @@ def delete_user(user_id: int) -> bool:
     Returns True, if user already existed and was successfuly deleted.
     """
     session = get_session()
-    user = session.get(User, user_id)
-    if user is None:
+    stmt = delete(User).where(User.id == user_id).returning(User.login, User.token)
+    row = session.execute(stmt).first()
+    commit_or_flush(session)
+    if row is None:
         return False
-
-    session.delete(user)
-    session.commit()
+    lookup_cache_pop(session, ("user_by_login", row.login), ("user_by_token", row.token))
     return True
 
 
-import hashlib
+# Pre-initialized context; copy() is cheaper than building a new one per call.
+_SHA256_TEMPLATE = hashlib.sha256()
+
+def _pass_digest(s: str) -> bytes:
+    """
+    Raw 32-byte SHA-256 digest of a plaintext password.
+    """
+    h = _SHA256_TEMPLATE.copy()
+    h.update(s.encode("utf-8"))
+    return h.digest()
+
+
 def _hash_pass(s: str) -> str:
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+    """
+    SHA-256 hex digest, matching sda.auth.config.sha256_hex() so hashes
+    written by either side verify. hashlib runs on OpenSSL, which uses
+    the CPU SHA extensions (SHA-NI / ARMv8) where available.
+    """
+    return _pass_digest(s).hex()
 
 
 def verify_credentials(login: str, pass_plain: str) -> Optional[User]:
     """
     Return login and password if all is correctly, else None
     """
+    # Hash before the lookup so a missing login costs the same as a bad password.
+    digest = _pass_digest(pass_plain)
+
     user = get_user_by_login(login)
     if user is None:
         return None
 
-    if _hash_pass(pass_plain) != user.pass_hash:
+    try:
+        stored = bytes.fromhex(user.pass_hash)
+    except (TypeError, ValueError):
+        return None
+
+    # Constant-time compare on the raw 32-byte digests.
+    if not hmac.compare_digest(digest, stored):
         return None
 
     return user
@@ -111,11 +195,10 @@ def exists_user(login: str | None = None, user_id: int | None = None) -> bool:
     if login is None and user_id is None:
         raise ValueError("exists_user() requires login or user_id.")
 
+    # SELECT EXISTS(...): no User row (hash, token) is fetched or built.
+    session = get_session()
     if login is not None:
-        return get_user_by_login(login) is not None
-
-    if user_id is not None:
-        return get_user_by_id(user_id) is not None
+        return bool(session.scalar(select(exists().where(User.login == login))))
 
-    return False
+    return bool(session.scalar(select(exists().where(User.id == user_id))))
 
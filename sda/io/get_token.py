@@ -7,7 +7,7 @@ CDSE OAuth token acquisition helpers.
 import os, re, requests
 from tqdm import tqdm
 
-from .download_fast import make_session
+from .download_fast import shared_session
 from .cdse_consts import (
     CDSE_TOKEN_URL,
     CDSE_CLIENT_ID,
@@ -15,7 +15,7 @@ from .cdse_consts import (
     TokenData
 )
 
-_session: requests.Session = make_session()
+_session: requests.Session = shared_session()
 
 def get_cdse_token(
         username: str, 
@@ -4,13 +4,30 @@ from __future__ import annotations
 Search utilities for recent CDSE STAC items.
 """
 
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pystac_client import Client
 from .cdse_consts import CDSE_CLIENT_URL
 from typing import Optional
 from pystac import Item
 
-_client: Client = Client.open(url=CDSE_CLIENT_URL)
+_client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+def _get_client() -> Client:
+    """
+    Return the shared STAC client, opening the catalog on first use.
+
+    Deferred so importing sda.io does no network I/O; the lock keeps
+    concurrent first calls (search_latest_many) from opening it twice.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = Client.open(url=CDSE_CLIENT_URL)
+    return _client
 
 def search_latest(
         collection: str, 
@@ -30,7 +47,7 @@ def search_latest(
     start = (day_utc - timedelta(days=fallback_days)).isoformat()
     end   = (day_utc + timedelta(days=1)).isoformat()
 
-    search = _client.search(
+    search = _get_client().search(
         collections=[collection],
         intersects=aoi_geojson,
         datetime=f"{start}/{end}",
@@ -43,3 +60,29 @@ def search_latest(
     for it in search.items():
         return it
     return None
+
+def search_latest_many(
+        queries: list[tuple[str, dict, datetime]],
+        fallback_days: int = 14,
+        max_workers: int = 8
+        ) -> list[Optional[Item]]:
+    """
+    Run search_latest() for many (collection, aoi_geojson, day_utc) queries.
+
+    Queries are issued concurrently on up to `max_workers` threads over the
+    shared client so their HTTP round-trips overlap; results keep the
+    order of `queries`.
+
+    Args:
+        queries        – list of (collection, aoi_geojson, day_utc) tuples.
+        fallback_days  – passed to every search_latest() call.
+        max_workers    – maximum number of concurrent requests.
+    """
+    if not queries:
+        return []
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+        return list(pool.map(
+            lambda q: search_latest(*q, fallback_days=fallback_days),
+            queries,
+        ))
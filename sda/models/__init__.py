@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+"""
+ORM models.
+
+Importing any model imports this package first, which registers every
+mapped class; relationships that name another model by string (e.g.
+Scene.changes_before -> "Change") then always resolve.
+"""
+
+from sda.models.apikey import ApiKey
+from sda.models.cdse_token import CDSEToken
+from sda.models.change import Change
+from sda.models.index_artifact import IndexArtifact
+from sda.models.index_feature import IndexFeature
+from sda.models.index_feature_set import IndexFeatureSet
+from sda.models.label import ChangeMethod, IndexName
+from sda.models.path import PathDir, PathEntry
+from sda.models.region import Region
+from sda.models.run import Run
+from sda.models.scene import Scene
+from sda.models.scene_asset import SceneAsset
+from sda.models.stats import Stats
+from sda.models.user import User
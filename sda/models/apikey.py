@@ -5,10 +5,10 @@ from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy import String, Boolean, DateTime, Integer
 
-from sda.db.base import Base
+from sda.db.base import Base, CreatedAtMixin
 
 
-class ApiKey(Base):
+class ApiKey(Base, CreatedAtMixin):
     __tablename__ = "api_keys"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -16,6 +16,4 @@ class ApiKey(Base):
     name: Mapped[str] = mapped_column(String(128), nullable=False, default="")
     key_hash: Mapped[str] = mapped_column(String(64), nullable=False, unique=True, index=True)
     is_revoked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
     last_used_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import DateTime, String, Integer, Boolean
-from sda.db.base import Base
+from sqlalchemy import DateTime, String, Integer, Boolean, Index
+from sda.db.base import Base, TimestampMixin
 
-class CDSEToken(Base):
+class CDSEToken(Base, TimestampMixin):
     """
     Persisted CDSE OAuth token data for a login.
 
@@ -13,6 +13,9 @@ class CDSEToken(Base):
     required for expiry checks and audit trails.
     """
     __tablename__ = "cdse_token"
+    # get_latest_token()/get_latest_valid_token(): WHERE login ORDER BY issued_at DESC.
+    # A btree is scanned backwards for DESC, so ascending order serves both.
+    __table_args__ = (Index("ix_cdse_token_login_issued_at", "login", "issued_at"),)
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
@@ -29,5 +32,3 @@ class CDSEToken(Base):
     expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
 
     is_revoked: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
-    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,32 +1,67 @@
 from __future__ import annotations
 
-from datetime import datetime
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, Integer, JSON
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, UniqueConstraint
 
-from sda.db.base import Base
+from sda.db.base import Base, BigIntKey, CreatedAtMixin, JSONDoc, SHA256Digest, SmallIntKey
+from sda.models.label import ChangeMethod, IndexName
+from sda.models.path import PathEntry
+from sda.models.scene import Scene
 
 
-class Change(Base):
+class Change(Base, CreatedAtMixin):
     """
     Raster delta between two scenes for the same index.
     Example: dNDVI, dNBR.
     """
     __tablename__ = "changes"
+    # Natural key: lets register_change() use INSERT ... ON CONFLICT DO NOTHING.
+    # Its index also serves scene-pair lookups and scene_before_id-only filters.
+    __table_args__ = (
+        UniqueConstraint(
+            "scene_before_id", "scene_after_id", "index_id", "method_id", name="uq_change_pair_index_method"
+        ),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
 
-    scene_before_id: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
-    scene_after_id: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
+    scene_before_id: Mapped[int] = mapped_column(
+        BigIntKey, ForeignKey("scenes.id", ondelete="CASCADE"), nullable=False
+    )
+    scene_after_id: Mapped[int] = mapped_column(
+        BigIntKey, ForeignKey("scenes.id", ondelete="CASCADE"), index=True, nullable=False
+    )
 
-    index_name: Mapped[str] = mapped_column(String(16), index=True)
-    method: Mapped[str] = mapped_column(String(32))          # diff / zscore / seasonal
-    thresholds: Mapped[dict] = mapped_column(JSON, default=dict)
+    # Labels as SMALLINT ids into index_names / change_methods; see
+    # sda.db.labels.get_or_create_label().
+    index_id: Mapped[int] = mapped_column(SmallIntKey, ForeignKey("index_names.id"), index=True, nullable=False)
+    method_id: Mapped[int] = mapped_column(SmallIntKey, ForeignKey("change_methods.id"), nullable=False)
+    thresholds: Mapped[dict] = mapped_column(JSONDoc, default=dict)
 
-    path: Mapped[str] = mapped_column(String(512), nullable=False)
-    sha256: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    path_id: Mapped[int] = mapped_column(BigIntKey, ForeignKey("paths.id"), nullable=False)
+    sha256: Mapped[bytes] = mapped_column(SHA256Digest, index=True, nullable=False)
 
-    created_at: Mapped[datetime] = mapped_column(
-        DateTime, default=datetime.utcnow, nullable=False
+    # Raise on lazy access; load explicitly, e.g. selectinload(Change.scene_before).
+    scene_before: Mapped[Scene] = relationship(
+        foreign_keys=[scene_before_id], back_populates="changes_before", lazy="raise"
+    )
+    scene_after: Mapped[Scene] = relationship(
+        foreign_keys=[scene_after_id], back_populates="changes_after", lazy="raise"
     )
 
+    # Almost always read with the row, so they are joined into the same SELECT.
+    path_entry: Mapped[PathEntry] = relationship(lazy="joined")
+    index_label: Mapped[IndexName] = relationship(lazy="joined")
+    method_label: Mapped[ChangeMethod] = relationship(lazy="joined")
+
+    @property
+    def path(self) -> str:
+        return self.path_entry.full_path
+
+    @property
+    def index_name(self) -> str:
+        return self.index_label.name
+
+    @property
+    def method(self) -> str:
+        return self.method_label.name
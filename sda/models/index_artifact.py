@@ -1,28 +1,55 @@
 from __future__ import annotations
 
-from datetime import datetime
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, Integer, JSON
+from typing import TYPE_CHECKING
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, ForeignKey, UniqueConstraint
 
-from sda.db.base import Base
+from sda.db.base import Base, BigIntKey, JSONDoc, SHA256Digest, TimestampMixin
+from sda.models.index_feature import IndexFeature
+from sda.models.index_feature_set import IndexFeatureSet
+from sda.models.path import PathEntry
 
+if TYPE_CHECKING:
+    from sda.models.scene import Scene
 
-class IndexArtifact(Base):
+
+class IndexArtifact(Base, TimestampMixin):
     """
     Raster index computed on the 10 m grid (NDVI, NBR, etc.).
     """
     __tablename__ = "index_artifacts"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
-
-    scene_id: Mapped[int] = mapped_column(Integer, index=True, nullable=False)
+    # Natural key: lets register_index_path(s) use INSERT ... ON CONFLICT DO NOTHING.
+    # Its index also serves get_indices(scene_id=..., index_name=...) and
+    # list_indices_one().
+    __table_args__ = (
+        UniqueConstraint("scene_id", "index_name", "resolution_m", name="uq_artifact_scene_index_res"),
+    )
+
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
+
+    scene_id: Mapped[int] = mapped_column(
+        BigIntKey, ForeignKey("scenes.id", ondelete="CASCADE"), nullable=False
+    )
     index_name: Mapped[str] = mapped_column(String(16), index=True)
     resolution_m: Mapped[int] = mapped_column(Integer, default=10)
 
-    path: Mapped[str] = mapped_column(String(512), nullable=False)
-    sha256: Mapped[str] = mapped_column(String(64), index=True, nullable=False)
+    path_id: Mapped[int] = mapped_column(BigIntKey, ForeignKey("paths.id"), nullable=False)
+    sha256: Mapped[bytes] = mapped_column(SHA256Digest, index=True, nullable=False)
+
+    meta_data: Mapped[dict] = mapped_column(JSONDoc, default=dict)
+
+    # Raise on lazy access; load explicitly, e.g. selectinload(IndexArtifact.features).
+    scene: Mapped[Scene] = relationship(back_populates="artifacts", lazy="raise")
+    features: Mapped[list[IndexFeature]] = relationship(
+        back_populates="artifact", lazy="raise", passive_deletes=True
+    )
+    feature_set: Mapped[IndexFeatureSet | None] = relationship(
+        back_populates="artifact", lazy="raise", passive_deletes=True
+    )
 
-    meta_data: Mapped[dict] = mapped_column(JSON, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Almost always read with the row, so it is joined into the same SELECT.
+    path_entry: Mapped[PathEntry] = relationship(lazy="joined")
 
+    @property
+    def path(self) -> str:
+        return self.path_entry.full_path
@@ -1,26 +1,30 @@
 from __future__ import annotations
 
-from datetime import datetime
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, Integer, Float
+from typing import TYPE_CHECKING
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Float, ForeignKey
 
-from sda.db.base import Base
+from sda.db.base import Base, BigIntKey, CreatedAtMixin
 
+if TYPE_CHECKING:
+    from sda.models.index_artifact import IndexArtifact
 
-class IndexFeature(Base):
+
+class IndexFeature(Base, CreatedAtMixin):
     """
     Scalar features derived from an IndexArtifact.
     Example: mean NDVI, std NDVI, vegetation area ratio.
     """
     __tablename__ = "index_features"
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
 
-    artifact_id: Mapped[int] = mapped_column(Integer, index=True)
+    artifact_id: Mapped[int] = mapped_column(
+        BigIntKey, ForeignKey("index_artifacts.id", ondelete="CASCADE"), index=True
+    )
 
     key: Mapped[str] = mapped_column(String(64))
     value: Mapped[float] = mapped_column(Float)
     units: Mapped[str | None] = mapped_column(String(32), nullable=True)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-
+    artifact: Mapped[IndexArtifact] = relationship(back_populates="features", lazy="raise")
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import TYPE_CHECKING
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DateTime, ForeignKey, Index, func
+
+from sda.db.base import Base, BigIntKey, JSONDoc
+
+if TYPE_CHECKING:
+    from sda.models.index_artifact import IndexArtifact
+
+
+class IndexFeatureSet(Base):
+    """
+    All scalar features of one IndexArtifact as a single JSON object.
+    Example: {"mean": 0.42, "std": 0.1, "veg_ratio": 0.63}.
+
+    Kept in step with the IndexFeature rows by the sda.db.indices writers;
+    reading every feature of an artifact is one row fetch instead of one
+    per key.
+    """
+    __tablename__ = "index_feature_sets"
+    # Key/containment filters on features (`features ? 'mean'`,
+    # `features @> '{...}'`); PostgreSQL only.
+    __table_args__ = (
+        Index("ix_feature_set_gin", "features", postgresql_using="gin").ddl_if(dialect="postgresql"),
+    )
+
+    artifact_id: Mapped[int] = mapped_column(
+        BigIntKey, ForeignKey("index_artifacts.id", ondelete="CASCADE"), primary_key=True
+    )
+    features: Mapped[dict] = mapped_column(JSONDoc, nullable=False, default=dict)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    artifact: Mapped[IndexArtifact] = relationship(back_populates="feature_set", lazy="raise")
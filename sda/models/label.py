@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import String
+
+from sda.db.base import Base, SmallIntKey
+
+
+class IndexName(Base):
+    """
+    Index label referenced by Change rows (e.g. "NDVI", "NBR").
+    """
+    __tablename__ = "index_names"
+
+    id: Mapped[int] = mapped_column(SmallIntKey, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(16), unique=True, nullable=False)
+
+
+class ChangeMethod(Base):
+    """
+    Change-detection method referenced by Change rows (e.g. "diff", "zscore").
+    """
+    __tablename__ = "change_methods"
+
+    id: Mapped[int] = mapped_column(SmallIntKey, primary_key=True, autoincrement=True)
+    name: Mapped[str] = mapped_column(String(32), unique=True, nullable=False)
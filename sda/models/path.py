@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Text, UniqueConstraint
+
+from sda.db.base import Base, BigIntKey
+
+
+class PathDir(Base):
+    """
+    Interned directory prefix shared by many artifact files.
+    """
+    __tablename__ = "path_dirs"
+
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
+
+    # Everything up to and including the last separator ("" for bare names).
+    path: Mapped[str] = mapped_column(Text, unique=True, nullable=False)
+
+
+class PathEntry(Base):
+    """
+    One file path, stored as (directory id, file name).
+
+    Artifact tables reference this by id instead of repeating the full
+    path string in every row; see sda.db.paths.intern_paths().
+    """
+    __tablename__ = "paths"
+    __table_args__ = (UniqueConstraint("dir_id", "name", name="uq_path_dir_name"),)
+
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
+
+    dir_id: Mapped[int] = mapped_column(BigIntKey, ForeignKey("path_dirs.id"), nullable=False)
+    name: Mapped[str] = mapped_column(Text, nullable=False)
+
+    dir: Mapped[PathDir] = relationship(lazy="joined")
+
+    @property
+    def full_path(self) -> str:
+        return self.dir.path + self.name
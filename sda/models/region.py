@@ -1,16 +1,24 @@
 # sda/models/region.py
 from __future__ import annotations
 
-from datetime import datetime
-
-from sqlalchemy import Float, Integer, String, JSON, DateTime
+from sqlalchemy import Float, Integer, String, Index, text
 from sqlalchemy.orm import Mapped, mapped_column
 
-from sda.db.base import Base
+from sda.db.base import Base, JSONDoc, TimestampMixin, bbox_constraints
 
 
-class Region(Base):
+class Region(Base, TimestampMixin):
     __tablename__ = "regions"
+    # Bbox overlap (`&&`) probes on the box built from the four float columns.
+    # The expression must match the query exactly; PostgreSQL only.
+    __table_args__ = (
+        Index(
+            "ix_region_bbox_spgist",
+            text("box(point(lon_min, lat_min), point(lon_max, lat_max))"),
+            postgresql_using="spgist",
+        ).ddl_if(dialect="postgresql"),
+        *bbox_constraints("region"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(128), unique=True, nullable=False, index=True)
@@ -21,8 +29,4 @@ class Region(Base):
     lon_max: Mapped[float] = mapped_column(Float, nullable=False)
     lat_max: Mapped[float] = mapped_column(Float, nullable=False)
 
-    meta: Mapped[dict] = mapped_column(JSON, nullable=True)
-
-    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
-
+    meta: Mapped[dict] = mapped_column(JSONDoc, nullable=True)
@@ -1,28 +1,61 @@
 from __future__ import annotations
 
+import enum
 from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, Integer, JSON, Boolean
+from sqlalchemy import String, DateTime, Enum, Integer, Boolean, Index, func
 
-from sda.db.base import Base
+from sda.db.base import Base, BigIntKey, CreatedAtMixin, JSONDoc
 
 
-class Run(Base):
-    __tablename__ = "runs"
+class RunStatus(str, enum.Enum):
+    """
+    Run lifecycle state; members compare equal to their plain strings.
+    Declaration order gives the numeric codes accepted by list_runs_one().
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    FINISHED = "finished"
+    FAILED = "failed"
+    KILLED = "killed"
+
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+class Run(Base, CreatedAtMixin):
+    __tablename__ = "runs"
+    __table_args__ = (
+        # Serves list_runs_one()/list_run_summaries() (user_id + optional status).
+        Index("ix_run_user_status", "user_id", "status"),
+        # Containment filters on params (`params @> '{...}'`); PostgreSQL only.
+        Index(
+            "ix_run_params_gin",
+            "params",
+            postgresql_using="gin",
+            postgresql_ops={"params": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Append-only, so created_at follows insert order; PostgreSQL only.
+        Index("ix_run_created_brin", "created_at", postgresql_using="brin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
 
     user_id: Mapped[int] = mapped_column(Integer, index=True)
     profile: Mapped[str] = mapped_column(String(16))
 
-    params: Mapped[dict] = mapped_column(JSON)
-    status: Mapped[str] = mapped_column(String(16), index=True)
+    params: Mapped[dict] = mapped_column(JSONDoc)
+    status: Mapped[RunStatus] = mapped_column(
+        Enum(
+            RunStatus,
+            name="run_status_enum",
+            values_callable=lambda e: [m.value for m in e],
+            validate_strings=True,
+        ),
+        index=True,
+    )
 
     success: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     error: Mapped[str | None] = mapped_column(String(512), nullable=True)
 
-    started_at: Mapped[datetime] = mapped_column(DateTime)
-    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1,31 +1,81 @@
 from __future__ import annotations
 
+import enum
 from datetime import datetime
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, Integer, JSON, Float
+from typing import TYPE_CHECKING, Sequence
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import BigInteger, String, DateTime, Enum, Integer, Float, Index, text
 
-from sda.db.base import Base
+from sda.db.base import Base, BigIntKey, CreatedAtMixin, bbox_constraints
+from sda.models.index_artifact import IndexArtifact
+from sda.models.scene_asset import SceneAsset
 
+if TYPE_CHECKING:
+    from sda.models.change import Change
 
-class Scene(Base):
+
+class Satellite(str, enum.Enum):
+    """
+    Sentinel-2 platform; members compare equal to their plain strings.
+    """
+    S2A = "S2A"
+    S2B = "S2B"
+    S2C = "S2C"
+
+
+class ProcessingLevel(str, enum.Enum):
+    """
+    Sentinel-2 product level.
+    """
+    L1C = "L1C"
+    L2A = "L2A"
+
+
+class Scene(Base, CreatedAtMixin):
     """
     One satellite acquisition on a fixed grid.
     Derived directly from Sentinel-2 L2A metadata.
     """
     __tablename__ = "scenes"
+    __table_args__ = (
+        # Time series per tile: WHERE tile = ? [AND acquisition_time range] ORDER BY time.
+        Index("ix_scene_tile_time", "tile", "acquisition_time"),
+        # Bbox overlap (`&&`) probes, see sda.db.scenes.list_scenes_in_bbox().
+        # The expression must match the query exactly; PostgreSQL only.
+        Index(
+            "ix_scene_bbox_spgist",
+            text("box(point(lon_min, lat_min), point(lon_max, lat_max))"),
+            postgresql_using="spgist",
+        ).ddl_if(dialect="postgresql"),
+        # Time-range scans; rows arrive roughly in acquisition order, so a BRIN
+        # index is a tiny fraction of a btree's size. PostgreSQL only.
+        Index("ix_scene_acq_brin", "acquisition_time", postgresql_using="brin").ddl_if(
+            dialect="postgresql"
+        ),
+        *bbox_constraints("scene"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
 
     # External identifiers
     product_id: Mapped[str] = mapped_column(String(128), unique=True, index=True)
-    satellite: Mapped[str] = mapped_column(String(8), nullable=False)   # S2A / S2B / S2C
-    tile: Mapped[str] = mapped_column(String(8), index=True)            # e.g. T41VNE
+    satellite: Mapped[Satellite] = mapped_column(
+        Enum(Satellite, name="satellite_enum", validate_strings=True), nullable=False
+    )
+    tile: Mapped[str] = mapped_column(String(8))                        # e.g. T41VNE
 
-    acquisition_time: Mapped[datetime] = mapped_column(DateTime, index=True)
+    acquisition_time: Mapped[datetime] = mapped_column(DateTime)
 
     # Spatial definition (canonical 10 m grid)
     crs: Mapped[str] = mapped_column(String(32))                         # EPSG:32641
-    transform: Mapped[list[float]] = mapped_column(JSON)                 # affine (9 elems)
+    # Affine coefficients (x = a*col + b*row + c, y = d*col + e*row + f),
+    # stored inline instead of a JSON list; see Scene.transform.
+    aff_a: Mapped[float] = mapped_column(Float)
+    aff_b: Mapped[float] = mapped_column(Float)
+    aff_c: Mapped[float] = mapped_column(Float)
+    aff_d: Mapped[float] = mapped_column(Float)
+    aff_e: Mapped[float] = mapped_column(Float)
+    aff_f: Mapped[float] = mapped_column(Float)
     width: Mapped[int] = mapped_column(Integer)
     height: Mapped[int] = mapped_column(Integer)
 
@@ -34,8 +84,47 @@ class Scene(Base):
     lon_max: Mapped[float] = mapped_column(Float)
     lat_max: Mapped[float] = mapped_column(Float)
 
-    processing_level: Mapped[str] = mapped_column(String(8), default="L2A")
+    # Z-order range of the smallest Web-Mercator tile holding the bbox
+    # (sda.utils.quadkey.bbox_range); tile lookups become BETWEEN scans,
+    # see sda.db.scenes.list_scenes_in_tiles().
+    quadkey_lo: Mapped[int | None] = mapped_column(BigInteger, index=True, nullable=True)
+    quadkey_hi: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+
+    processing_level: Mapped[ProcessingLevel] = mapped_column(
+        Enum(ProcessingLevel, name="processing_level_enum", validate_strings=True),
+        default=ProcessingLevel.L2A,
+    )
     source_zip: Mapped[str] = mapped_column(String(512))
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    # Collections raise on lazy access; load them explicitly, e.g. with
+    # selectinload(Scene.assets). Child rows are removed by ON DELETE CASCADE.
+    assets: Mapped[list[SceneAsset]] = relationship(
+        back_populates="scene", lazy="raise", passive_deletes=True
+    )
+    artifacts: Mapped[list[IndexArtifact]] = relationship(
+        back_populates="scene", lazy="raise", passive_deletes=True
+    )
+    changes_before: Mapped[list[Change]] = relationship(
+        foreign_keys="Change.scene_before_id",
+        back_populates="scene_before",
+        lazy="raise",
+        passive_deletes=True,
+    )
+    changes_after: Mapped[list[Change]] = relationship(
+        foreign_keys="Change.scene_after_id",
+        back_populates="scene_after",
+        lazy="raise",
+        passive_deletes=True,
+    )
+
+    @property
+    def transform(self) -> tuple[float, ...]:
+        """
+        Full 3x3 affine as 9 coefficients (row-major, last row 0, 0, 1);
+        affine.Affine(*scene.transform[:6]) rebuilds the rasterio object.
+        """
+        return (self.aff_a, self.aff_b, self.aff_c, self.aff_d, self.aff_e, self.aff_f, 0.0, 0.0, 1.0)
 
+    @transform.setter
+    def transform(self, coeffs: Sequence[float]) -> None:
+        self.aff_a, self.aff_b, self.aff_c, self.aff_d, self.aff_e, self.aff_f = coeffs[:6]
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-from datetime import datetime
-from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import String, DateTime, Integer, Boolean, JSON
+from typing import TYPE_CHECKING
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Integer, Boolean, ForeignKey, UniqueConstraint
 
-from sda.db.base import Base
+from sda.db.base import Base, BigIntKey, CreatedAtMixin, SHA256Digest
+from sda.models.path import PathEntry
 
+if TYPE_CHECKING:
+    from sda.models.scene import Scene
 
-class SceneAsset(Base):
+
+class SceneAsset(Base, CreatedAtMixin):
     """
     Any raster directly tied to a Scene:
     - raw bands (B04_10m, B12_20m)
@@ -15,19 +19,30 @@ class SceneAsset(Base):
     - masks (SCL_10m)
     """
     __tablename__ = "scene_assets"
+    # Natural key: lets register_asset(s) use INSERT ... ON CONFLICT DO NOTHING.
+    # Its index also serves list_assets_one(), get_asset()/exists_asset().
+    __table_args__ = (
+        UniqueConstraint("scene_id", "kind", "resolution_m", name="uq_asset_scene_kind_res"),
+    )
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(BigIntKey, primary_key=True, autoincrement=True)
 
-    scene_id: Mapped[int] = mapped_column(Integer, index=True)
+    scene_id: Mapped[int] = mapped_column(BigIntKey, ForeignKey("scenes.id", ondelete="CASCADE"))
 
     kind: Mapped[str] = mapped_column(String(32), index=True)
     resolution_m: Mapped[int] = mapped_column(Integer)   # 10 or 20
     dtype: Mapped[str] = mapped_column(String(16))       # uint16 / uint8 / float32
 
-    path: Mapped[str] = mapped_column(String(512))
-    sha256: Mapped[str] = mapped_column(String(64), index=True)
+    path_id: Mapped[int] = mapped_column(BigIntKey, ForeignKey("paths.id"), nullable=False)
+    sha256: Mapped[bytes] = mapped_column(SHA256Digest, index=True)
 
     is_resampled: Mapped[bool] = mapped_column(Boolean, default=False)
 
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    scene: Mapped[Scene] = relationship(back_populates="assets", lazy="raise")
+
+    # Almost always read with the row, so it is joined into the same SELECT.
+    path_entry: Mapped[PathEntry] = relationship(lazy="joined")
 
+    @property
+    def path(self) -> str:
+        return self.path_entry.full_path
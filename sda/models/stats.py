@@ -1,18 +1,22 @@
 from __future__ import annotations
 
-from datetime import datetime
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import DateTime, Integer, JSON
+from sqlalchemy import Index
 
-from sda.db.base import Base
+from sda.db.base import Base, BigIntKey, JSONDoc, TimestampMixin
 
 
-class Stats(Base):
+class Stats(Base, TimestampMixin):
     __tablename__ = "stats"
+    # Containment filters on stats (`stats @> '{...}'`); PostgreSQL only.
+    __table_args__ = (
+        Index(
+            "ix_stats_stats_gin",
+            "stats",
+            postgresql_using="gin",
+            postgresql_ops={"stats": "jsonb_path_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
-    run_id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    stats: Mapped[dict] = mapped_column(JSON)
-
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-
+    run_id: Mapped[int] = mapped_column(BigIntKey, primary_key=True)
+    stats: Mapped[dict] = mapped_column(JSONDoc)
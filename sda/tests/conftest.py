@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import pytest
+
+import sda.models  # noqa: F401  (registers every mapped class)
+from sda.auth.config import Config
+from sda.db.base import Base
+from sda.db.engine import dispose_engine, init_engine
+from sda.db.scenes import create_scene
+from sda.db.session import close_all_sessions, close_session
+
+
+@pytest.fixture
+def db(tmp_path):
+    """
+    Fresh SQLite database file with the full schema, via init_engine().
+
+    A file (not :memory:) so each connection is a separate SQLite
+    connection, as with separate processes on a server database.
+    """
+    cfg = Config()
+    cfg.__dict__["pg_dsn"] = f"sqlite:///{tmp_path / 'sda.db'}"
+    engine = init_engine(cfg)
+    Base.metadata.create_all(engine)
+    yield engine
+    close_session()
+    close_all_sessions()
+    dispose_engine()
+
+
+@pytest.fixture
+def make_scene(db):
+    """
+    Factory for minimal Scene rows: make_scene("P1").id
+    """
+    def make(product_id: str):
+        return create_scene(
+            product_id, "S2A", "T41VNE", datetime(2024, 1, 1), "EPSG:32641",
+            [0.0] * 9, 1, 1, 0.0, 0.0, 1.0, 1.0,
+        )
+    return make
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.exc import OperationalError
+
+from sda.db import api_keys
+from sda.db.session import get_session
+from sda.db.users import create_user
+from sda.models import ApiKey
+
+
+@pytest.fixture
+def keys(db, monkeypatch):
+    """
+    Three API keys of one user, with an empty last_used_at buffer that is
+    not due for a flush.
+    """
+    monkeypatch.setattr(api_keys, "_last_used", {})
+    monkeypatch.setattr(api_keys, "_last_flush", time.monotonic())
+    monkeypatch.setattr(api_keys, "_LAST_USED_FLUSH_S", 3600.0)
+    user = create_user("alice", "hash")
+    return [plain for plain, _ in api_keys.create_api_keys("k0", "k1", "k2", user_ids=[user.id])]
+
+
+def _last_used_at() -> list:
+    session = get_session()
+    session.expire_all()
+    return list(session.scalars(select(ApiKey.last_used_at).order_by(ApiKey.id)))
+
+
+def test_hits_buffered_until_flush(keys, monkeypatch):
+    assert api_keys.valid_api_key(keys[0])
+    assert list(api_keys._last_used) == [1]
+    assert _last_used_at() == [None, None, None]
+
+    # Interval elapsed: the next hit writes the buffer.
+    monkeypatch.setattr(api_keys, "_last_flush", time.monotonic() - 3600.0)
+    assert api_keys.valid_api_key(keys[1])
+    assert api_keys._last_used == {}
+    used = _last_used_at()
+    assert used[0] is not None and used[1] is not None and used[2] is None
+
+
+def test_flush_is_one_update(keys, db):
+    assert all(api_keys.valid_api_keys(*keys).values())
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db, "before_cursor_execute", record)
+    try:
+        assert api_keys.flush_last_used() == 3
+    finally:
+        event.remove(db, "before_cursor_execute", record)
+    updates = [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+    assert len(updates) == 1
+    assert None not in _last_used_at()
+
+
+def test_failed_flush_keeps_buffer(keys, monkeypatch):
+    assert api_keys.valid_api_key(keys[0])
+    buffered = dict(api_keys._last_used)
+
+    session = get_session()
+
+    def fail(*args, **kwargs):
+        raise OperationalError("UPDATE", {}, Exception("database is gone"))
+
+    with monkeypatch.context() as m:
+        m.setattr(session, "execute", fail)
+        with pytest.raises(OperationalError):
+            api_keys.flush_last_used(session=session)
+    assert api_keys._last_used == buffered
+
+    session.rollback()
+    assert api_keys.flush_last_used(session=session) == 1
+    assert api_keys._last_used == {}
+
+
+def test_exit_hook_writes_buffer(keys):
+    assert api_keys.valid_api_key(keys[2])
+    api_keys._flush_last_used_at_exit()
+    assert api_keys._last_used == {}
+    assert _last_used_at()[2] is not None
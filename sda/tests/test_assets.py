@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from sda.db import assets
+from sda.db.session import get_session
+from sda.models import PathEntry, SceneAsset
+
+
+def _count(model) -> int:
+    return get_session().scalar(select(func.count()).select_from(model))
+
+
+def _row(scene_id: int, kind: str, path: str) -> dict:
+    return {"scene_id": scene_id, "kind": kind, "resolution_m": 10, "dtype": "uint16", "path": path}
+
+
+def test_register_asset_returns_existing_row(make_scene):
+    scene_id = make_scene("P1").id
+    first = assets.register_asset(scene_id, "B04", 10, "uint16", "/data/b04.tif")
+    again = assets.register_asset(scene_id, "B04", 10, "uint16", "/data/b04_v2.tif")
+
+    assert again.id == first.id
+    assert again.path == "/data/b04.tif"
+    assert _count(PathEntry) == 1
+
+
+def test_register_assets_duplicate_in_batch(make_scene):
+    scene_id = make_scene("P1").id
+    rows = assets.register_assets([
+        _row(scene_id, "B04", "/data/b04.tif"),
+        _row(scene_id, "B04", "/data/b04_dup.tif"),
+    ])
+
+    assert rows[0].id == rows[1].id
+    assert rows[0].path == "/data/b04.tif"
+    assert _count(SceneAsset) == 1
+    assert _count(PathEntry) == 1
+
+
+def test_register_assets_duplicate_of_existing(make_scene):
+    scene_id = make_scene("P1").id
+    existing = assets.register_asset(scene_id, "B04", 10, "uint16", "/data/b04.tif")
+    (row,) = assets.register_assets([_row(scene_id, "B04", "/data/b04_v2.tif")])
+
+    assert row.id == existing.id
+    assert _count(PathEntry) == 1
+
+
+def test_register_assets_mixed_batch(make_scene):
+    scene_id = make_scene("P1").id
+    existing = assets.register_asset(scene_id, "B04", 10, "uint16", "/data/b04.tif")
+    rows = assets.register_assets([
+        _row(scene_id, "B08", "/data/b08.tif"),
+        _row(scene_id, "B04", "/data/b04_v2.tif"),
+        _row(scene_id, "B11", "/data/b11.tif"),
+        _row(scene_id, "B08", "/data/b08_dup.tif"),
+    ])
+
+    assert [r.kind for r in rows] == ["B08", "B04", "B11", "B08"]
+    assert rows[1].id == existing.id
+    assert rows[0].id == rows[3].id
+    assert [r.path for r in rows] == ["/data/b08.tif", "/data/b04.tif", "/data/b11.tif", "/data/b08.tif"]
+    assert _count(SceneAsset) == 3
+    assert _count(PathEntry) == 3
+
+
+def test_register_assets_reselects_raced_keys(make_scene, monkeypatch):
+    scene_id = make_scene("P1").id
+    intern_paths = assets.intern_paths
+
+    def intern_and_race(session, paths):
+        # Another writer registers B08 between the up-front SELECT and the INSERT.
+        session.add(SceneAsset(
+            scene_id=scene_id, kind="B08", resolution_m=10, dtype="uint16",
+            path_id=intern_paths(session, ["/other/b08.tif"])[0], sha256=b"\0" * 32,
+        ))
+        session.flush()
+        return intern_paths(session, paths)
+
+    monkeypatch.setattr(assets, "intern_paths", intern_and_race)
+    rows = assets.register_assets([_row(scene_id, "B04", "/data/b04.tif"), _row(scene_id, "B08", "/data/b08.tif")])
+
+    assert [r.kind for r in rows] == ["B04", "B08"]
+    assert rows[1].path == "/other/b08.tif"
+    assert _count(SceneAsset) == 2
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from sda.db import changes
+from sda.db.session import get_session
+from sda.models import Change, PathEntry
+
+_SHA = "ab" * 32
+
+
+def _count(model) -> int:
+    return get_session().scalar(select(func.count()).select_from(model))
+
+
+def test_register_change_returns_existing_row(make_scene):
+    before, after = make_scene("P1").id, make_scene("P2").id
+    first = changes.register_change(before, after, "NDVI", "diff", {}, "/data/c1.tif", _SHA)
+    again = changes.register_change(before, after, "NDVI", "diff", {"t": 1}, "/data/c2.tif", _SHA)
+
+    assert again.id == first.id
+    assert again.path == "/data/c1.tif"
+    assert _count(PathEntry) == 1
+
+
+def test_register_change_new_method_is_new_row(make_scene):
+    before, after = make_scene("P1").id, make_scene("P2").id
+    diff = changes.register_change(before, after, "NDVI", "diff", {}, "/data/c1.tif", _SHA)
+    zscore = changes.register_change(before, after, "NDVI", "zscore", {}, "/data/c2.tif", _SHA)
+
+    assert zscore.id != diff.id
+    assert (zscore.index_name, zscore.method) == ("NDVI", "zscore")
+    assert _count(Change) == 2
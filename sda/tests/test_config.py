@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+
+from sda.auth import cli, config
+
+
+def test_profile_switch_reloads_env(tmp_path, monkeypatch):
+    (tmp_path / ".env").write_text("PG_HOST=userhost\n")
+    (tmp_path / ".env.dev").write_text("PG_HOST=devhost\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "_loaded", None)
+    monkeypatch.delenv("PG_HOST", raising=False)
+
+    config.profile_load("dev")
+    assert config.Config().pg_host == "devhost"
+    config.profile_load("user")
+    assert config.Config().pg_host == "userhost"
+
+
+def test_clear_config_cache_rereads_env_file(tmp_path, monkeypatch):
+    env = tmp_path / ".env"
+    env.write_text("PG_HOST=first\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "_loaded", None)
+    monkeypatch.delenv("PG_HOST", raising=False)
+    monkeypatch.setenv("SDA_PROFILE", "user")
+
+    config.clear_config_cache()
+    assert config.get_config().pg_host == "first"
+
+    monkeypatch.setenv("PG_HOST", "edited-in-process")
+    config.clear_config_cache()
+    assert config.get_config().pg_host == "first"
+    config.clear_config_cache()
+
+
+def _compile_env(tmp_path, monkeypatch):
+    (tmp_path / ".env").write_text("PG_HOST=parsed\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    monkeypatch.setattr(config, "_loaded", None)
+    monkeypatch.delenv("PG_HOST", raising=False)
+    cli.compile_env(profile="user")
+
+    compiled = config.compiled_env_path(".env")
+    assert compiled.parent == tmp_path / "cache" / "sda"
+    assert stat.S_IMODE(compiled.stat().st_mode) == 0o600
+    # Mark the compiled values so the tests can tell which source was used.
+    data = json.loads(compiled.read_text())
+    data["env"]["PG_HOST"] = "compiled"
+    compiled.write_text(json.dumps(data))
+    return compiled
+
+
+def test_compiled_env_used_when_source_unchanged(tmp_path, monkeypatch):
+    _compile_env(tmp_path, monkeypatch)
+    config.profile_load("user")
+    assert os.environ["PG_HOST"] == "compiled"
+
+
+def test_compiled_env_ignored_when_source_changed(tmp_path, monkeypatch):
+    _compile_env(tmp_path, monkeypatch)
+    env = tmp_path / ".env"
+    mtime = env.stat().st_mtime_ns
+    os.utime(env, ns=(mtime + 10**9, mtime + 10**9))
+    config.profile_load("user")
+    assert os.environ["PG_HOST"] == "parsed"
+
+
+def test_compiled_env_ignored_for_other_source(tmp_path, monkeypatch):
+    compiled = _compile_env(tmp_path, monkeypatch)
+    data = json.loads(compiled.read_text())
+    data["source"] = "/elsewhere/.env"
+    compiled.write_text(json.dumps(data))
+    config.profile_load("user")
+    assert os.environ["PG_HOST"] == "parsed"
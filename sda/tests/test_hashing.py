@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import hashlib
+
+from sda.db import _hashing
+from sda.db._hashing import hash_file, hash_file_or_path
+
+
+def test_hash_small_file(tmp_path):
+    path = tmp_path / "small.bin"
+    data = b"sda" * 1000
+    path.write_bytes(data)
+    assert hash_file(str(path)) == hashlib.sha256(data).digest()
+
+
+def test_hash_chunked_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(_hashing, "_MMAP_MAX_BYTES", 1024)
+    monkeypatch.setattr(_hashing, "_CHUNK_BYTES", 1000)
+    path = tmp_path / "large.bin"
+    data = bytes(range(256)) * 40  # 10240 bytes: over the mmap limit, 11 chunks
+    path.write_bytes(data)
+    assert hash_file(str(path)) == hashlib.sha256(data).digest()
+
+
+def test_hash_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    assert hash_file(str(path)) == hashlib.sha256(b"").digest()
+
+
+def test_hash_missing_file_hashes_path(tmp_path):
+    path = str(tmp_path / "missing.tif")
+    assert hash_file_or_path(path) == hashlib.sha256(path.encode("utf-8")).digest()
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from sqlalchemy import delete
+
+from sda.db import indices
+from sda.db.session import get_session
+from sda.models import IndexFeatureSet
+
+
+def test_feature_set_merge_keeps_and_overwrites_keys(make_scene):
+    artifact = indices.register_index_path(make_scene("P1").id, "NDVI", "/data/ndvi.tif")
+    indices.register_index_values(artifact.id, {"mean": 0.4, "std": 0.1})
+    indices.register_index_value(artifact.id, "mean", 0.5)
+    indices.copy_index_values(artifact.id, {"max": 0.9, "std": 0.2})
+
+    assert indices.get_index_features(artifact.id) == {"mean": 0.5, "std": 0.2, "max": 0.9}
+    assert indices.get_index_features(artifact.id, ["max", "min"]) == {"max": 0.9}
+
+
+def test_backfill_rebuilds_feature_sets(make_scene):
+    scene_id = make_scene("P1").id
+    ndvi = indices.register_index_path(scene_id, "NDVI", "/data/ndvi.tif")
+    nbr = indices.register_index_path(scene_id, "NBR", "/data/nbr.tif")
+    indices.register_index_values(ndvi.id, {"mean": 0.4, "std": 0.1})
+    indices.register_index_values(nbr.id, {"mean": -0.2})
+
+    session = get_session()
+    session.execute(delete(IndexFeatureSet).where(IndexFeatureSet.artifact_id == ndvi.id))
+    session.commit()
+
+    assert indices.backfill_index_feature_sets() == 2
+    assert indices.get_index_features(ndvi.id) == {"mean": 0.4, "std": 0.1}
+    assert indices.get_index_features(nbr.id) == {"mean": -0.2}
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from sda.db.labels import get_or_create_label
+from sda.db.session import get_session
+from sda.models import IndexName
+
+
+def test_label_recreated_after_rollback(db):
+    session = get_session()
+    get_or_create_label(session, IndexName, "NDVI")
+    session.rollback()
+
+    label_id = get_or_create_label(session, IndexName, "NDVI")
+    assert session.get(IndexName, label_id).name == "NDVI"
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from sda.db.paths import intern_paths
+from sda.db.session import get_session
+from sda.models import PathEntry
+
+
+def test_intern_after_rollback(db):
+    session = get_session()
+    intern_paths(session, ["/data/a.tif"])
+    session.rollback()
+
+    (entry_id,) = intern_paths(session, ["/data/b.tif"])
+    entry = session.get(PathEntry, entry_id)
+    assert entry.dir.path + entry.name == "/data/b.tif"
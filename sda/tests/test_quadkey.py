@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from sda.utils.quadkey import bbox2ancestors, bbox2ranges, bbox_range, fit_zoom, tile_count
+
+
+def test_fit_zoom_bounds_tile_count():
+    bbox = (10.0, 50.0, 11.0, 51.0)
+    zoom = fit_zoom(*bbox, 16, 256)
+    assert zoom < 16
+    assert tile_count(*bbox, zoom) <= 256
+    assert tile_count(*bbox, zoom + 1) > 256
+
+
+def test_scene_range_matches_query_ranges():
+    bbox = (10.0, 50.0, 11.0, 51.0)
+    lo, hi = bbox_range(*bbox)
+    for zoom in range(0, 10):
+        inside = any(r_lo <= lo <= r_hi for r_lo, r_hi in bbox2ranges(*bbox, zoom))
+        assert inside or (lo, hi) in bbox2ancestors(*bbox, zoom)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import psycopg
+
+from sda.db import assets, indices, scenes
+from sda.db.scenes import _LIST_SCENES_FILTERED
+from sda.db.session import get_session
+from sda.models import IndexArtifact, SceneAsset
+
+
+def test_list_scenes_filtered_binds_satellite_as_enum():
+    sql = str(_LIST_SCENES_FILTERED.compile(dialect=psycopg.dialect()))
+    assert "scenes.satellite = CAST(%(satellite)s AS satellite_enum)" in sql
+    assert "%(satellite)s::VARCHAR" not in sql
+
+
+def test_delete_scene_cascades_on_sqlite(make_scene):
+    scene = make_scene("P1")
+    assets.register_asset(scene.id, "B04", 10, "uint16", "/data/b04.tif")
+    indices.register_index_path(scene.id, "NDVI", "/data/ndvi.tif")
+
+    assert scenes.delete_scene_by_pk(scene.id)
+    session = get_session()
+    assert session.scalar(select(func.count()).select_from(SceneAsset)) == 0
+    assert session.scalar(select(func.count()).select_from(IndexArtifact)) == 0
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import pytest
+
+from sda.db.session import lookup_cache_get, lookup_cache_put, session_scope
+
+
+def test_lookup_cache_dropped_at_scope_exit(db):
+    with session_scope() as session:
+        lookup_cache_put(session, "key", 1)
+        assert lookup_cache_get(session, "key") == 1
+    assert lookup_cache_get(session, "key") is None
+
+
+def test_lookup_cache_dropped_when_scope_fails(db):
+    with pytest.raises(RuntimeError):
+        with session_scope() as session:
+            lookup_cache_put(session, "key", 1)
+            raise RuntimeError("boom")
+    assert lookup_cache_get(session, "key") is None
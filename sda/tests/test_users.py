@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from sqlalchemy import delete
+
+from sda.db import users
+from sda.db.session import get_session
+from sda.models import User
+
+
+def test_cached_user_dropped_on_commit(db):
+    user = users.create_user("alice", "hash")
+    assert users.get_user_by_login("alice") is user
+
+    # Deleted by another process.
+    with db.begin() as conn:
+        conn.execute(delete(User))
+
+    get_session().commit()
+    assert users.get_user_by_login("alice") is None
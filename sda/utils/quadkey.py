@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+"""
+Web-Mercator quadkeys packed as integers (Z-order / Morton codes).
+
+A tile (x, y) at zoom z is the integer whose bit pairs are the quadkey
+digits, most significant first. Expanded to QUADKEY_ZOOM, every tile
+covers one contiguous [lo, hi] range, and a child's range nests inside
+its parent's, so "inside tile T" becomes a single BETWEEN on a B-tree.
+"""
+
+import math
+
+# Finest zoom level; 2 bits per level, so ranges fit in a signed BIGINT.
+QUADKEY_ZOOM = 24
+
+# Web-Mercator latitude limit.
+_MAX_LAT = 85.05112878
+
+
+def _tile_xy(lon: float, lat: float, zoom: int) -> tuple[int, int]:
+    """
+    Tile (x, y) containing (lon, lat) at `zoom`, clamped to the world.
+    """
+    n = 1 << zoom
+    lat = max(-_MAX_LAT, min(_MAX_LAT, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def _interleave(x: int, y: int, zoom: int) -> int:
+    """
+    Morton code of tile (x, y): y bit high, x bit low, per level.
+    """
+    code = 0
+    for bit in range(zoom - 1, -1, -1):
+        code = (code << 2) | (((y >> bit) & 1) << 1) | ((x >> bit) & 1)
+    return code
+
+
+def tile_range(x: int, y: int, zoom: int) -> tuple[int, int]:
+    """
+    [lo, hi] quadkey range at QUADKEY_ZOOM covered by tile (x, y, zoom).
+    """
+    if not 0 <= zoom <= QUADKEY_ZOOM:
+        raise ValueError(f"tile_range(): zoom must be in 0..{QUADKEY_ZOOM}")
+    shift = 2 * (QUADKEY_ZOOM - zoom)
+    code = _interleave(x, y, zoom)
+    return code << shift, ((code + 1) << shift) - 1
+
+
+def bbox_range(min_lon: float, min_lat: float, max_lon: float, max_lat: float) -> tuple[int, int]:
+    """
+    Range of the smallest tile that contains the whole bbox.
+
+    Stored on Scene as (quadkey_lo, quadkey_hi).
+    """
+    x0, y0 = _tile_xy(min_lon, max_lat, QUADKEY_ZOOM)
+    x1, y1 = _tile_xy(max_lon, min_lat, QUADKEY_ZOOM)
+    zoom = QUADKEY_ZOOM - max((x0 ^ x1).bit_length(), (y0 ^ y1).bit_length())
+    shift = QUADKEY_ZOOM - zoom
+    return tile_range(x0 >> shift, y0 >> shift, zoom)
+
+
+def _tile_bounds(
+    min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int
+) -> tuple[int, int, int, int]:
+    """
+    Inclusive tile bounds (x0, y0, x1, y1) of the bbox at `zoom`.
+    """
+    x0, y0 = _tile_xy(min_lon, max_lat, zoom)
+    x1, y1 = _tile_xy(max_lon, min_lat, zoom)
+    return x0, y0, x1, y1
+
+
+def tile_count(min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int) -> int:
+    """
+    Number of tiles at `zoom` covering the bbox.
+    """
+    x0, y0, x1, y1 = _tile_bounds(min_lon, min_lat, max_lon, max_lat, zoom)
+    return (x1 - x0 + 1) * (y1 - y0 + 1)
+
+
+def fit_zoom(
+    min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int, max_tiles: int
+) -> int:
+    """
+    Highest zoom <= `zoom` at which the bbox is covered by at most
+    `max_tiles` tiles (zoom 0 is always a single tile).
+    """
+    while zoom > 0 and tile_count(min_lon, min_lat, max_lon, max_lat, zoom) > max_tiles:
+        zoom -= 1
+    return zoom
+
+
+def bbox2ranges(
+    min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int
+) -> list[tuple[int, int]]:
+    """
+    Quadkey ranges of the tiles at `zoom` covering the bbox.
+
+    Adjacent ranges are merged, so a bbox that fills whole parent tiles
+    yields few ranges. Sorted by lo. Builds one range per tile; bound the
+    tile count first (see fit_zoom()).
+    """
+    x0, y0, x1, y1 = _tile_bounds(min_lon, min_lat, max_lon, max_lat, zoom)
+    ranges = sorted(tile_range(x, y, zoom) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1))
+    merged: list[tuple[int, int]] = []
+    for lo, hi in ranges:
+        if merged and lo == merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], hi)
+        else:
+            merged.append((lo, hi))
+    return merged
+
+
+def bbox2ancestors(
+    min_lon: float, min_lat: float, max_lon: float, max_lat: float, zoom: int
+) -> list[tuple[int, int]]:
+    """
+    Ranges of every strict ancestor (zoom 0..zoom-1) of the covering tiles.
+
+    A row whose stored range is one of these contains part of the bbox
+    without falling inside any bbox2ranges() range. The ancestors at each
+    level are the tiles within the shifted bounds, so the result is about
+    a third of the tile count plus a few per level.
+    """
+    x0, y0, x1, y1 = _tile_bounds(min_lon, min_lat, max_lon, max_lat, zoom)
+    cells: list[tuple[int, int]] = []
+    for level in range(zoom):
+        shift = zoom - level
+        for x in range(x0 >> shift, (x1 >> shift) + 1):
+            for y in range(y0 >> shift, (y1 >> shift) + 1):
+                cells.append(tile_range(x, y, level))
+    return sorted(cells)